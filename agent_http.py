@@ -53,7 +53,7 @@ from src.core.constants import (  # noqa: E402
 from src.core.tracer import ExecutionTracer  # noqa: E402
 from src.core.logging_config import setup_http_logging  # noqa: E402
 from src.core.output import (  # noqa: E402
-    format_result,
+    format_result_dict,
     print_result_box,
     print_sessions_table,
     print_status,
@@ -631,7 +631,7 @@ def main() -> int:
         if args.json:
             output_text = json.dumps(result, indent=2)
         else:
-            output_text = format_result(result, session_id=session_id)
+            output_text = format_result_dict(result, session_id=session_id)
         Path(args.output).write_text(output_text)
         print_status(f"Results written to: {args.output}", "dim")
 
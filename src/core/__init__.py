@@ -58,6 +58,8 @@ from .logging_config import (
 )
 from .output import (
     format_result,
+    format_result_dict,
+    format_result_obj,
     print_output_box,
     print_result_box,
     print_sessions_table,
@@ -171,6 +173,8 @@ __all__ = [
     "setup_backend_logging",
     # Output
     "format_result",
+    "format_result_dict",
+    "format_result_obj",
     "print_output_box",
     "print_result_box",
     "print_sessions_table",
@@ -56,9 +56,9 @@ from .cli_common import (
 from .constants import AnsiColors, LOG_PREVIEW_LENGTH, StatusIcons
 from .exceptions import AgentError, TaskError
 from .logging_config import setup_cli_logging
-from .output import format_result, print_sessions_table
+from .output import format_result_obj, print_sessions_table
 from .permission_config import (
-    AVAILABLE_TOOLS,
+    available_tools,
     create_default_permissions_file,
 )
 from .permission_profiles import (
@@ -164,7 +164,7 @@ def show_tools() -> None:
 
     # Group tools by category
     categories: dict[str, list] = {}
-    for tool in AVAILABLE_TOOLS.values():
+    for tool in available_tools().values():
         cat = tool.category.value
         if cat not in categories:
             categories[cat] = []
@@ -184,7 +184,7 @@ def show_tools() -> None:
                 print(f"    Examples: {', '.join(tool.example_patterns[:3])}")
 
     print("\n" + "=" * 70)
-    print(f"Total: {len(AVAILABLE_TOOLS)} tools")
+    print(f"Total: {len(available_tools())} tools")
     print("=" * 70 + "\n")
 
 
@@ -300,7 +300,7 @@ async def execute_task(args: argparse.Namespace, config_loader: AgentConfigLoade
         if args.json:
             output = result.model_dump_json(indent=2)
         else:
-            output = format_result(result)
+            output = format_result_obj(result)
 
         if args.output:
             Path(args.output).write_text(output)
@@ -818,9 +818,9 @@ class ClaudeAgent:
             if self._permission_manager is not None:
                 active_profile = self._permission_manager.active_profile
                 # Get allow/deny/allowed_dirs from permissions if available
-                allow_rules: list[str] = []
-                deny_rules: list[str] = []
-                allowed_dirs: list[str] = []
+                allow_rules: tuple[str, ...] = ()
+                deny_rules: tuple[str, ...] = ()
+                allowed_dirs: tuple[str, ...] = ()
                 if active_profile.permissions is not None:
                     allow_rules = active_profile.permissions.allow
                     deny_rules = active_profile.permissions.deny
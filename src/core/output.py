@@ -13,6 +13,8 @@ Both output.py and tracer.py use these utilities for consistent styling.
 Usage:
     from .output import (
         format_result,
+        format_result_dict,
+        format_result_obj,
         print_result_box,
         print_sessions_table,
         format_duration,
@@ -43,6 +45,19 @@ from .constants import (
 )
 
 
+# Pre-allocated padding; sliced instead of repeating ' ' for every box line.
+_PAD = " " * 1024
+
+# Plain-string aliases for styling used on every box line
+_RESET = AnsiColors.RESET.value
+_WHITE = AnsiColors.WHITE.value
+_VBAR = BoxChars.VERTICAL
+_HBAR = BoxChars.HORIZONTAL
+
+# Negative slice index keeping the tail of a truncated working directory
+_WD_TAIL = -(WORKING_DIR_TRUNCATE_LENGTH - 3)
+
+
 # =============================================================================
 # Terminal Utilities
 # =============================================================================
@@ -239,22 +254,13 @@ def print_status(message: str, status: str = "info") -> None:
 # Result Attribute Helper
 # =============================================================================
 
-def _get_result_attr(result: Any, attr: str, default: Any = None) -> Any:
-    """
-    Get attribute from result object or dict.
+def _get_dict_attr(result: dict, attr: str, default: Any = None) -> Any:
+    """Get attribute from a dict response from the API."""
+    return result.get(attr, default)
 
-    Supports both AgentResult objects and dict responses from API.
 
-    Args:
-        result: AgentResult object or dict.
-        attr: Attribute name to retrieve.
-        default: Default value if attribute not found.
-
-    Returns:
-        Attribute value or default.
-    """
-    if isinstance(result, dict):
-        return result.get(attr, default)
+def _get_obj_attr(result: Any, attr: str, default: Any = None) -> Any:
+    """Get attribute from an AgentResult object."""
     return getattr(result, attr, default)
 
 
@@ -262,34 +268,15 @@ def _get_result_attr(result: Any, attr: str, default: Any = None) -> Any:
 # Result Formatting
 # =============================================================================
 
-def format_result(result: Any, session_id: Optional[str] = None) -> str:
-    """
-    Format agent result for human-readable output.
-
-    Args:
-        result: AgentResult object or dict.
-        session_id: Optional session ID override.
-
-    Returns:
-        Formatted string suitable for file output or display.
-    """
-    if isinstance(result, dict):
-        status = result.get("status", "UNKNOWN")
-        error = result.get("error", "")
-        comments = result.get("comments", "")
-        output = result.get("output", "")
-        result_files = result.get("result_files", [])
-        sid = session_id or result.get("session_id", "")
-    else:
-        status = result.status
-        error = result.error
-        comments = result.comments
-        output = result.output
-        result_files = result.result_files or []
-        sid = session_id
-        if result.session_info:
-            sid = result.session_info.session_id
-
+def _format_result_lines(
+    status: Any,
+    error: Any,
+    comments: Any,
+    output: Any,
+    result_files: list[str],
+    sid: Optional[str],
+) -> str:
+    """Join result fields into the plain-text result format."""
     lines = [f"Status: {status}"]
 
     if error:
@@ -303,8 +290,7 @@ def format_result(result: Any, session_id: Optional[str] = None) -> str:
 
     if result_files:
         lines.append("Files:")
-        for filepath in result_files:
-            lines.append(f"  - {filepath}")
+        lines.extend(map("  - {}".format, result_files))
 
     if sid:
         lines.append(f"Session: {sid}")
@@ -312,6 +298,77 @@ def format_result(result: Any, session_id: Optional[str] = None) -> str:
     return "\n".join(lines)
 
 
+def format_result_dict(result: dict, session_id: Optional[str] = None) -> str:
+    """
+    Format a result dict (API response) for human-readable output.
+
+    Args:
+        result: Result dict as returned by the API.
+        session_id: Optional session ID override.
+
+    Returns:
+        Formatted string suitable for file output or display.
+    """
+    return _format_result_lines(
+        result.get("status", "UNKNOWN"),
+        result.get("error", ""),
+        result.get("comments", ""),
+        result.get("output", ""),
+        result.get("result_files", []),
+        session_id or result.get("session_id", ""),
+    )
+
+
+def format_result_obj(result: Any, session_id: Optional[str] = None) -> str:
+    """
+    Format an AgentResult object for human-readable output.
+
+    Args:
+        result: AgentResult object.
+        session_id: Optional session ID override.
+
+    Returns:
+        Formatted string suitable for file output or display.
+    """
+    sid = session_id
+    if result.session_info:
+        sid = result.session_info.session_id
+    return _format_result_lines(
+        result.status,
+        result.error,
+        result.comments,
+        result.output,
+        result.result_files or [],
+        sid,
+    )
+
+
+def format_result(result: Any, session_id: Optional[str] = None) -> str:
+    """
+    Format agent result for human-readable output.
+
+    Dispatches to format_result_dict or format_result_obj; callers that
+    always hold one kind of result can call those directly.
+
+    Args:
+        result: AgentResult object or dict.
+        session_id: Optional session ID override.
+
+    Returns:
+        Formatted string suitable for file output or display.
+    """
+    if isinstance(result, dict):
+        return format_result_dict(result, session_id)
+    return format_result_obj(result, session_id)
+
+
+def _pad(padding: int) -> str:
+    """Return a string of ``padding`` spaces sliced from the shared pad."""
+    if padding > len(_PAD):
+        return " " * padding
+    return _PAD[:max(padding, 0)]
+
+
 def _print_box_line(
     text: str,
     inner_width: int,
@@ -319,15 +376,12 @@ def _print_box_line(
     text_color: str = ""
 ) -> None:
     """Print a single line within a box."""
-    C = AnsiColors
-    B = BoxChars
-    padding = inner_width - len(text)
-    color = text_color or C.WHITE
+    color = text_color or _WHITE
     print(
-        f"{border_color}{B.VERTICAL}{C.RESET}"
-        f"{color}{text}{C.RESET}"
-        f"{' ' * max(0, padding)}"
-        f"{border_color}{B.VERTICAL}{C.RESET}"
+        f"{border_color}{_VBAR}{_RESET}"
+        f"{color}{text}{_RESET}"
+        f"{_pad(inner_width - len(text))}"
+        f"{border_color}{_VBAR}{_RESET}"
     )
 
 
@@ -353,6 +407,10 @@ def print_output_box(
         status: Status string (COMPLETE, PARTIAL, FAILED).
         terminal_width: Terminal width (auto-detected if None).
     """
+    # Check if we have any content to display before doing any layout work
+    if not (output or error or comments or result_files):
+        return
+
     C = AnsiColors
     B = BoxChars
 
@@ -371,19 +429,14 @@ def print_output_box(
         box_color = C.ERROR
         title = f"{StatusIcons.FAILURE} Output"
 
-    # Check if we have any content to display
-    has_content = output or error or comments or result_files
-    if not has_content:
-        return
-
     # Top border with inline title: ┌─ Title ─────────────┐
     title_segment = f" {title} "
     left_border_len = 1  # One horizontal char before title
     right_border_len = inner_width - left_border_len - len(title_segment)
     print(
-        f"{box_color}{B.TOP_LEFT}{B.HORIZONTAL}{C.RESET}"
-        f"{box_color}{title_segment}{C.RESET}"
-        f"{box_color}{B.HORIZONTAL * right_border_len}{B.TOP_RIGHT}{C.RESET}"
+        f"{box_color}{B.TOP_LEFT}{_HBAR}{_RESET}"
+        f"{box_color}{title_segment}{_RESET}"
+        f"{box_color}{_HBAR * right_border_len}{B.TOP_RIGHT}{_RESET}"
     )
 
     # Error line
@@ -411,12 +464,12 @@ def print_output_box(
         if len(output_text) > max_len:
             output_text = output_text[:max_len - 3] + "..."
         output_line = f" > {output_text}"
-        _print_box_line(output_line, inner_width, box_color, C.WHITE)
+        _print_box_line(output_line, inner_width, box_color, _WHITE)
 
     # Result files
     if result_files:
         files_line = f" {StatusIcons.FOLDER} Result Files: {len(result_files)}"
-        _print_box_line(files_line, inner_width, box_color, C.WHITE)
+        _print_box_line(files_line, inner_width, box_color, _WHITE)
         for filepath in result_files[:5]:
             display_path = str(filepath)
             if len(display_path) > inner_width - 8:
@@ -428,7 +481,7 @@ def print_output_box(
             _print_box_line(more_line, inner_width, box_color, C.DIM)
 
     # Bottom border
-    print(f"{box_color}{B.BOTTOM_LEFT}{B.HORIZONTAL * inner_width}{B.BOTTOM_RIGHT}{C.RESET}")
+    print(f"{box_color}{B.BOTTOM_LEFT}{_HBAR * inner_width}{B.BOTTOM_RIGHT}{_RESET}")
     print()
 
 
@@ -450,8 +503,10 @@ def print_result_box(result: Any, session_id: Optional[str] = None) -> None:
     width = terminal_width - 2
     inner_width = width - 2
 
+    get_attr = _get_dict_attr if isinstance(result, dict) else _get_obj_attr
+
     # Determine status and styling
-    status_raw = _get_result_attr(result, "status", "FAILED")
+    status_raw = get_attr(result, "status", "FAILED")
     status_upper = str(status_raw).upper()
     is_complete = status_upper in ("COMPLETE", "TASKSTATUS.COMPLETE")
     is_partial = status_upper in ("PARTIAL", "TASKSTATUS.PARTIAL")
@@ -476,24 +531,24 @@ def print_result_box(result: Any, session_id: Optional[str] = None) -> None:
     # =========================================================================
 
     # Top border
-    print(f"{status_color}{B.TOP_LEFT}{B.HORIZONTAL * inner_width}{B.TOP_RIGHT}{C.RESET}")
+    print(f"{status_color}{B.TOP_LEFT}{_HBAR * inner_width}{B.TOP_RIGHT}{_RESET}")
 
     # Status line (centered)
     status_content = f"{status_icon} {status_text}"
     status_padding = (inner_width - len(status_content)) // 2
     print(
-        f"{status_color}{B.VERTICAL}{C.RESET}"
-        f"{' ' * status_padding}"
-        f"{status_color}{C.BOLD}{status_content}{C.RESET}"
-        f"{' ' * (inner_width - status_padding - len(status_content))}"
-        f"{status_color}{B.VERTICAL}{C.RESET}"
+        f"{status_color}{_VBAR}{_RESET}"
+        f"{_pad(status_padding)}"
+        f"{status_color}{C.BOLD}{status_content}{_RESET}"
+        f"{_pad(inner_width - status_padding - len(status_content))}"
+        f"{status_color}{_VBAR}{_RESET}"
     )
 
     # Separator
-    print(f"{status_color}{B.LEFT_T}{B.HORIZONTAL * inner_width}{B.RIGHT_T}{C.RESET}")
+    print(f"{status_color}{B.LEFT_T}{_HBAR * inner_width}{B.RIGHT_T}{_RESET}")
 
     # Metrics
-    metrics = _get_result_attr(result, "metrics")
+    metrics = get_attr(result, "metrics")
     if metrics:
         if isinstance(metrics, dict):
             duration_ms = metrics.get("duration_ms") or 0
@@ -512,7 +567,7 @@ def print_result_box(result: Any, session_id: Optional[str] = None) -> None:
         duration_str = format_duration(duration_ms)
         cost_str = format_cost(cost)
         metrics_line = f" Duration: {duration_str} | Turns: {turns} | Cost: {cost_str}"
-        _print_box_line(metrics_line, inner_width, status_color, C.WHITE)
+        _print_box_line(metrics_line, inner_width, status_color, _WHITE)
 
         # Line 2: Token usage (if available)
         if usage:
@@ -545,7 +600,7 @@ def print_result_box(result: Any, session_id: Optional[str] = None) -> None:
                 )
 
             tokens_line = " " + " | ".join(token_parts)
-            _print_box_line(tokens_line, inner_width, status_color, C.WHITE)
+            _print_box_line(tokens_line, inner_width, status_color, _WHITE)
 
             # Cache info (if relevant)
             if cache_creation > 0 or cache_read > 0:
@@ -558,7 +613,7 @@ def print_result_box(result: Any, session_id: Optional[str] = None) -> None:
                 _print_box_line(cache_line, inner_width, status_color, C.GRAY)
 
     # Session ID
-    session_info = _get_result_attr(result, "session_info")
+    session_info = get_attr(result, "session_info")
     if session_info:
         sid = (
             session_info.session_id
@@ -566,24 +621,24 @@ def print_result_box(result: Any, session_id: Optional[str] = None) -> None:
             else session_info.get("session_id")
         )
     else:
-        sid = session_id or _get_result_attr(result, "session_id")
+        sid = session_id or get_attr(result, "session_id")
 
     if sid:
         session_line = f" Session: {sid}"
         _print_box_line(session_line, inner_width, status_color, C.GRAY)
 
     # Bottom border
-    print(f"{status_color}{B.BOTTOM_LEFT}{B.HORIZONTAL * inner_width}{B.BOTTOM_RIGHT}{C.RESET}")
+    print(f"{status_color}{B.BOTTOM_LEFT}{_HBAR * inner_width}{B.BOTTOM_RIGHT}{_RESET}")
     print()
 
     # =========================================================================
     # Output Box (if there's output, error, comments, or files)
     # =========================================================================
 
-    output_text = _get_result_attr(result, "output", "")
-    error = _get_result_attr(result, "error", "")
-    comments = _get_result_attr(result, "comments", "")
-    result_files = _get_result_attr(result, "result_files", [])
+    output_text = get_attr(result, "output", "")
+    error = get_attr(result, "error", "")
+    comments = get_attr(result, "comments", "")
+    result_files = get_attr(result, "result_files", [])
 
     # Use shared output box function for consistent formatting
     print_output_box(
@@ -639,7 +694,7 @@ def print_sessions_table(sessions: list[Any]) -> None:
 
         # Truncate long working directory paths
         if len(working_dir) > WORKING_DIR_TRUNCATE_LENGTH:
-            working_dir = "..." + working_dir[-(WORKING_DIR_TRUNCATE_LENGTH - 3):]
+            working_dir = "..." + working_dir[_WD_TAIL:]
 
         print(
             f"{session_id:<{SESSION_ID_WIDTH}} "
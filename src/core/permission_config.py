@@ -9,17 +9,25 @@ Provides a comprehensive permission management system with:
 - Schema validation using Pydantic
 """
 import fnmatch
+import functools
 import json
 import logging
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import StrEnum
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional, Sequence
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 # Import paths from central config
 from ..config import AGENT_DIR, CONFIG_DIR
-from .tool_utils import extract_patterns_for_tool
+from .tool_utils import index_patterns_by_tool
 
 logger = logging.getLogger(__name__)
 
@@ -51,44 +59,36 @@ class ToolCategory(StrEnum):
     MISC = "misc"
 
 
-class ToolDefinition(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ToolDefinition:
     """
     Definition of a Claude Code tool.
 
     Contains metadata about the tool including its name, description,
-    category, and whether it's considered safe or dangerous.
+    category, and whether it's considered safe or dangerous. Tools form a
+    static registry, so this is a plain frozen dataclass rather than a
+    validated model.
     """
-    name: str = Field(
-        description="Tool identifier used in allow/deny rules"
-    )
-    description: str = Field(
-        description="""
-Detailed description of what the tool does
-and when it should be used"""
-    )
-    category: ToolCategory = Field(
-        description="Category for grouping similar tools"
-    )
-    is_safe: bool = Field(
-        default=False,
-        description="""
-Whether the tool is considered safe (read-only, no side effects).
-Safe tools can be auto-approved in certain permission modes."""
-    )
-    supports_patterns: bool = Field(
-        default=False,
-        description="""
-Whether the tool supports glob patterns in its arguments.
-Used for pattern-based allow/deny rules like Bash(git:*)."""
-    )
-    example_patterns: list[str] = Field(
-        default_factory=list,
-        description="Example patterns for allow/deny rules"
-    )
+    # Tool identifier used in allow/deny rules
+    name: str
+    # Detailed description of what the tool does and when it should be used
+    description: str
+    # Category for grouping similar tools
+    category: ToolCategory
+    # Whether the tool is considered safe (read-only, no side effects).
+    # Safe tools can be auto-approved in certain permission modes.
+    is_safe: bool = False
+    # Whether the tool supports glob patterns in its arguments.
+    # Used for pattern-based allow/deny rules like Bash(git:*).
+    supports_patterns: bool = False
+    # Example patterns for allow/deny rules
+    example_patterns: tuple[str, ...] = ()
 
 
 class HookConfig(BaseModel):
     """Configuration for a permission hook."""
+    model_config = ConfigDict(frozen=True)
+
     type: str = Field(
         default="command",
         description="Type of hook (command, script, etc.)"
@@ -104,34 +104,38 @@ class HookConfig(BaseModel):
 
 class HookMatcher(BaseModel):
     """Matcher configuration for hooks."""
+    model_config = ConfigDict(frozen=True)
+
     matcher: str = Field(
         default="*",
         description="""
 Pattern to match tool names.
 Use * for all tools or specific tool names."""
     )
-    hooks: list[HookConfig] = Field(
-        default_factory=list,
+    hooks: tuple[HookConfig, ...] = Field(
+        default=(),
         description="List of hooks to execute when matcher matches"
     )
 
 
 class HooksConfig(BaseModel):
     """Configuration for all permission hooks."""
-    PreToolUse: list[HookMatcher] = Field(
-        default_factory=list,
+    model_config = ConfigDict(frozen=True)
+
+    PreToolUse: tuple[HookMatcher, ...] = Field(
+        default=(),
         description="""
 Hooks executed before a tool is used.
 Can modify inputs or enforce policies."""
     )
-    PostToolUse: list[HookMatcher] = Field(
-        default_factory=list,
+    PostToolUse: tuple[HookMatcher, ...] = Field(
+        default=(),
         description="""
 Hooks executed after a tool is used.
 Useful for logging or cleanup."""
     )
-    PermissionRequest: list[HookMatcher] = Field(
-        default_factory=list,
+    PermissionRequest: tuple[HookMatcher, ...] = Field(
+        default=(),
         description="""
 Hooks executed when Claude requests permission.
 Can auto-approve or deny based on custom logic."""
@@ -147,38 +151,48 @@ class PermissionRules(BaseModel):
     - Read(./secrets/**) - Deny reading secrets folder
     - Edit(*) - Allow editing any file
     """
-    allow: list[str] = Field(
-        default_factory=list,
+    model_config = ConfigDict(frozen=True)
+
+    allow: tuple[str, ...] = Field(
+        default=(),
         description="""
 List of allowed tool patterns.
 Tools matching these patterns are permitted without prompts.
 Supports glob patterns like Bash(npm run lint), Read(~/.zshrc)."""
     )
-    deny: list[str] = Field(
-        default_factory=list,
+    deny: tuple[str, ...] = Field(
+        default=(),
         description="""
 List of denied tool patterns.
 Tools matching these patterns are explicitly prohibited.
 Deny rules take precedence over allow rules."""
     )
-    ask: list[str] = Field(
-        default_factory=list,
+    ask: tuple[str, ...] = Field(
+        default=(),
         description="""
 List of tool patterns that require confirmation.
 User will be prompted before these tools execute."""
     )
 
+    @field_validator("allow", "deny", "ask")
+    @classmethod
+    def intern_patterns(cls, v: tuple[str, ...]) -> tuple[str, ...]:
+        """Intern rule strings so repeated comparisons can use identity."""
+        return tuple(sys.intern(pattern) for pattern in v)
+
 
 class ToolsConfig(BaseModel):
     """Configuration for enabled/disabled tools."""
-    enabled: list[str] = Field(
-        default_factory=list,
+    model_config = ConfigDict(frozen=True)
+
+    enabled: tuple[str, ...] = Field(
+        default=(),
         description="""
 List of tools that are enabled for the agent.
 Empty list means all tools are enabled by default."""
     )
-    disabled: list[str] = Field(
-        default_factory=list,
+    disabled: tuple[str, ...] = Field(
+        default=(),
         description="""
 List of tools that are disabled for the agent.
 Disabled tools cannot be used even if allowed."""
@@ -192,6 +206,8 @@ class PermissionConfig(BaseModel):
     This is the main configuration model that combines all permission
     settings into a single, comprehensive structure.
     """
+    model_config = ConfigDict(frozen=True)
+
     defaultMode: PermissionMode = Field(
         default=PermissionMode.DEFAULT,
         description="Default permission mode for the agent"
@@ -208,8 +224,8 @@ class PermissionConfig(BaseModel):
         default_factory=HooksConfig,
         description="Hook configurations for dynamic permission management"
     )
-    allowedTools: list[str] = Field(
-        default_factory=list,
+    allowedTools: tuple[str, ...] = Field(
+        default=(),
         description="""
 Legacy: List of tools passed to Claude SDK.
 Prefer using tools.enabled instead."""
@@ -227,293 +243,669 @@ Prefer using tools.enabled instead."""
         return v
 
 
-# All available tools in Claude Code with their definitions
-AVAILABLE_TOOLS: dict[str, ToolDefinition] = {
-    "Bash": ToolDefinition(
-        name="Bash",
-        description="""
+@functools.cache
+def available_tools() -> dict[str, ToolDefinition]:
+    """
+    Get all available tools in Claude Code with their definitions.
+
+    Built on first use so that importing this module does not construct
+    the tool models.
+    """
+    return {
+        "Bash": ToolDefinition(
+            name="Bash",
+            description="""
 Execute shell commands in a bash environment.
 Supports running any shell command with arguments.
 Use with caution as it can modify the system.""",
-        category=ToolCategory.SHELL,
-        is_safe=False,
-        supports_patterns=True,
-        example_patterns=[
-            "Bash(git:*)",
-            "Bash(npm run:*)",
-            "Bash(python:*)",
-            "Bash(ls:*)",
-            "Bash(cat:*)",
-            "Bash(grep:*)",
-        ]
-    ),
-    "Read": ToolDefinition(
-        name="Read",
-        description="""
+            category=ToolCategory.SHELL,
+            is_safe=False,
+            supports_patterns=True,
+            example_patterns=(
+                "Bash(git:*)",
+                "Bash(npm run:*)",
+                "Bash(python:*)",
+                "Bash(ls:*)",
+                "Bash(cat:*)",
+                "Bash(grep:*)",
+            )
+        ),
+        "Read": ToolDefinition(
+            name="Read",
+            description="""
 Read contents of files from the filesystem.
 Supports reading text files with optional line ranges.
 Safe operation with no side effects.""",
-        category=ToolCategory.FILE_READ,
-        is_safe=True,
-        supports_patterns=True,
-        example_patterns=[
-            "Read(*)",
-            "Read(./src/**)",
-            "Read(~/.zshrc)",
-        ]
-    ),
-    "Write": ToolDefinition(
-        name="Write",
-        description="""
+            category=ToolCategory.FILE_READ,
+            is_safe=True,
+            supports_patterns=True,
+            example_patterns=(
+                "Read(*)",
+                "Read(./src/**)",
+                "Read(~/.zshrc)",
+            )
+        ),
+        "Write": ToolDefinition(
+            name="Write",
+            description="""
 Write content to files on the filesystem.
 Creates new files or overwrites existing ones.
 Can modify or create any file in accessible directories.""",
-        category=ToolCategory.FILE_WRITE,
-        is_safe=False,
-        supports_patterns=True,
-        example_patterns=[
-            "Write(*)",
-            "Write(./sessions/**)",
-        ]
-    ),
-    "Edit": ToolDefinition(
-        name="Edit",
-        description="""
+            category=ToolCategory.FILE_WRITE,
+            is_safe=False,
+            supports_patterns=True,
+            example_patterns=(
+                "Write(*)",
+                "Write(./sessions/**)",
+            )
+        ),
+        "Edit": ToolDefinition(
+            name="Edit",
+            description="""
 Edit existing files using search and replace.
 Finds specific text and replaces it with new content.
 Useful for making targeted modifications to code.""",
-        category=ToolCategory.FILE_WRITE,
-        is_safe=False,
-        supports_patterns=True,
-        example_patterns=[
-            "Edit(*)",
-            "Edit(./src/**/*.py)",
-        ]
-    ),
-    "MultiEdit": ToolDefinition(
-        name="MultiEdit",
-        description="""
+            category=ToolCategory.FILE_WRITE,
+            is_safe=False,
+            supports_patterns=True,
+            example_patterns=(
+                "Edit(*)",
+                "Edit(./src/**/*.py)",
+            )
+        ),
+        "MultiEdit": ToolDefinition(
+            name="MultiEdit",
+            description="""
 Make multiple edits to a single file in one operation.
 More efficient than multiple Edit calls for batch changes.
 Atomic operation - all edits apply or none do.""",
-        category=ToolCategory.FILE_WRITE,
-        is_safe=False,
-        supports_patterns=True,
-        example_patterns=[
-            "MultiEdit(*)",
-        ]
-    ),
-    "Grep": ToolDefinition(
-        name="Grep",
-        description="""
+            category=ToolCategory.FILE_WRITE,
+            is_safe=False,
+            supports_patterns=True,
+            example_patterns=(
+                "MultiEdit(*)",
+            )
+        ),
+        "Grep": ToolDefinition(
+            name="Grep",
+            description="""
 Search for patterns in files using regex.
 Returns matching lines with context.
 Safe read-only operation.""",
-        category=ToolCategory.SEARCH,
-        is_safe=True,
-        supports_patterns=False,
-        example_patterns=[]
-    ),
-    "Glob": ToolDefinition(
-        name="Glob",
-        description="""
+            category=ToolCategory.SEARCH,
+            is_safe=True,
+            supports_patterns=False,
+            example_patterns=()
+        ),
+        "Glob": ToolDefinition(
+            name="Glob",
+            description="""
 Find files matching glob patterns.
 Returns list of matching file paths.
 Safe read-only operation.""",
-        category=ToolCategory.SEARCH,
-        is_safe=True,
-        supports_patterns=False,
-        example_patterns=[]
-    ),
-    "LS": ToolDefinition(
-        name="LS",
-        description="""
+            category=ToolCategory.SEARCH,
+            is_safe=True,
+            supports_patterns=False,
+            example_patterns=()
+        ),
+        "LS": ToolDefinition(
+            name="LS",
+            description="""
 List directory contents with optional recursion.
 Returns file and directory names.
 Safe read-only operation.""",
-        category=ToolCategory.SEARCH,
-        is_safe=True,
-        supports_patterns=False,
-        example_patterns=[]
-    ),
-    "Task": ToolDefinition(
-        name="Task",
-        description="""
+            category=ToolCategory.SEARCH,
+            is_safe=True,
+            supports_patterns=False,
+            example_patterns=()
+        ),
+        "Task": ToolDefinition(
+            name="Task",
+            description="""
 Spawn a sub-agent to handle a specific task.
 Creates a new Claude instance for parallel work.
 Useful for breaking down complex tasks.""",
-        category=ToolCategory.AGENT,
-        is_safe=False,
-        supports_patterns=False,
-        example_patterns=[]
-    ),
-    "TodoRead": ToolDefinition(
-        name="TodoRead",
-        description="""
+            category=ToolCategory.AGENT,
+            is_safe=False,
+            supports_patterns=False,
+            example_patterns=()
+        ),
+        "TodoRead": ToolDefinition(
+            name="TodoRead",
+            description="""
 Read todo items from the task list.
 Returns current todos with status.
 Safe read-only operation.""",
-        category=ToolCategory.MISC,
-        is_safe=True,
-        supports_patterns=False,
-        example_patterns=[]
-    ),
-    "TodoWrite": ToolDefinition(
-        name="TodoWrite",
-        description="""
+            category=ToolCategory.MISC,
+            is_safe=True,
+            supports_patterns=False,
+            example_patterns=()
+        ),
+        "TodoWrite": ToolDefinition(
+            name="TodoWrite",
+            description="""
 Write or update todo items in the task list.
 Can create, update, or mark todos as complete.
 Modifies task state.""",
-        category=ToolCategory.MISC,
-        is_safe=False,
-        supports_patterns=False,
-        example_patterns=[]
-    ),
-    "NotebookEdit": ToolDefinition(
-        name="NotebookEdit",
-        description="""
+            category=ToolCategory.MISC,
+            is_safe=False,
+            supports_patterns=False,
+            example_patterns=()
+        ),
+        "NotebookEdit": ToolDefinition(
+            name="NotebookEdit",
+            description="""
 Edit Jupyter notebook cells.
 Can modify, add, or remove notebook cells.
 Supports code, markdown, and raw cells.""",
-        category=ToolCategory.NOTEBOOK,
-        is_safe=False,
-        supports_patterns=True,
-        example_patterns=[
-            "NotebookEdit(*.ipynb)",
-        ]
-    ),
-    "WebFetch": ToolDefinition(
-        name="WebFetch",
-        description="""
+            category=ToolCategory.NOTEBOOK,
+            is_safe=False,
+            supports_patterns=True,
+            example_patterns=(
+                "NotebookEdit(*.ipynb)",
+            )
+        ),
+        "WebFetch": ToolDefinition(
+            name="WebFetch",
+            description="""
 Fetch content from web URLs.
 Downloads and returns web page content.
 Requires network access.""",
-        category=ToolCategory.WEB,
-        is_safe=True,
-        supports_patterns=True,
-        example_patterns=[
-            "WebFetch(*)",
-        ]
-    ),
-    "WebSearch": ToolDefinition(
-        name="WebSearch",
-        description="""
+            category=ToolCategory.WEB,
+            is_safe=True,
+            supports_patterns=True,
+            example_patterns=(
+                "WebFetch(*)",
+            )
+        ),
+        "WebSearch": ToolDefinition(
+            name="WebSearch",
+            description="""
 Search the web for information.
 Returns search results with snippets.
 Requires network access.""",
-        category=ToolCategory.WEB,
-        is_safe=True,
-        supports_patterns=False,
-        example_patterns=[]
-    ),
-    "Skill": ToolDefinition(
-        name="Skill",
-        description="""
+            category=ToolCategory.WEB,
+            is_safe=True,
+            supports_patterns=False,
+            example_patterns=()
+        ),
+        "Skill": ToolDefinition(
+            name="Skill",
+            description="""
 Execute custom skills defined in the skills directory.
 Skills are predefined workflows or capabilities.
 Can be safe or dangerous depending on skill.""",
-        category=ToolCategory.AGENT,
-        is_safe=False,
-        supports_patterns=True,
-        example_patterns=[
-            "Skill(*)",
-            "Skill(test:*)",
-        ]
-    ),
-    "Agent": ToolDefinition(
-        name="Agent",
-        description="""
+            category=ToolCategory.AGENT,
+            is_safe=False,
+            supports_patterns=True,
+            example_patterns=(
+                "Skill(*)",
+                "Skill(test:*)",
+            )
+        ),
+        "Agent": ToolDefinition(
+            name="Agent",
+            description="""
 Invoke another agent for specialized tasks.
 Enables delegation to specialized sub-agents.
 May have its own permission set.""",
-        category=ToolCategory.AGENT,
-        is_safe=False,
-        supports_patterns=True,
-        example_patterns=[
-            "Agent(*)",
-        ]
-    ),
-}
+            category=ToolCategory.AGENT,
+            is_safe=False,
+            supports_patterns=True,
+            example_patterns=(
+                "Agent(*)",
+            )
+        ),
+    }
+
+@functools.cache
+def safe_tools() -> tuple[str, ...]:
+    """Get names of safe tools that can be auto-approved in certain modes."""
+    return tuple(
+        tool.name for tool in available_tools().values() if tool.is_safe
+    )
 
-# Safe tools that can be auto-approved in certain modes
-SAFE_TOOLS: list[str] = [
-    tool.name for tool in AVAILABLE_TOOLS.values() if tool.is_safe
-]
-
-# Dangerous tools that should require explicit approval
-DANGEROUS_TOOLS: list[str] = [
-    tool.name for tool in AVAILABLE_TOOLS.values() if not tool.is_safe
-]
-
-# Default permission configuration
-DEFAULT_PERMISSION_CONFIG = PermissionConfig(
-    defaultMode=PermissionMode.DEFAULT,
-    permissions=PermissionRules(
-        allow=[
-            # Safe read-only operations
-            "Read(*)",
-            "Grep",
-            "Glob",
-            "LS",
-            "TodoRead",
-            # Common safe bash commands
-            "Bash(git:*)",
-            "Bash(find:*)",
-            "Bash(grep:*)",
-            "Bash(ls:*)",
-            "Bash(cat:*)",
-            "Bash(head:*)",
-            "Bash(tail:*)",
-            "Bash(wc:*)",
-            "Bash(python:*)",
-            "Bash(echo:*)",
-            "Bash(mkdir:*)",
-            "Bash(cp:*)",
-            "Bash(mv:*)",
-        ],
-        deny=[
-            # Dangerous bash commands
-            "Bash(rm -rf:*)",
-            "Bash(sudo:*)",
-            "Bash(chmod 777:*)",
-            "Bash(curl|wget -O:*)",
-            # Sensitive file patterns
-            "Read(./.env)",
-            "Read(./secrets/**)",
-            "Read(**/.env*)",
-            "Read(**/secrets/**)",
-            "Write(./.env)",
-            "Write(./secrets/**)",
-            "Edit(./.env)",
-            "Edit(./secrets/**)",
-        ],
-        ask=[
-            # Potentially impactful operations that need confirmation
-            "Bash(git push:*)",
-            "Bash(git reset:*)",
-            "Bash(npm publish:*)",
-            "Bash(docker:*)",
-        ]
-    ),
-    tools=ToolsConfig(
-        enabled=[
+
+@functools.cache
+def dangerous_tools() -> tuple[str, ...]:
+    """Get names of dangerous tools that should require explicit approval."""
+    return tuple(
+        tool.name for tool in available_tools().values() if not tool.is_safe
+    )
+
+
+@functools.cache
+def tools_by_category() -> dict[ToolCategory, tuple[ToolDefinition, ...]]:
+    """Get available tools grouped by category, built on first use."""
+    grouped: dict[ToolCategory, list[ToolDefinition]] = {}
+    for tool in available_tools().values():
+        grouped.setdefault(tool.category, []).append(tool)
+    return {category: tuple(tools) for category, tools in grouped.items()}
+
+
+@functools.cache
+def default_permission_config() -> PermissionConfig:
+    """Get the default permission configuration, built on first use."""
+    return PermissionConfig(
+        defaultMode=PermissionMode.DEFAULT,
+        permissions=PermissionRules(
+            allow=[
+                # Safe read-only operations
+                "Read(*)",
+                "Grep",
+                "Glob",
+                "LS",
+                "TodoRead",
+                # Common safe bash commands
+                "Bash(git:*)",
+                "Bash(find:*)",
+                "Bash(grep:*)",
+                "Bash(ls:*)",
+                "Bash(cat:*)",
+                "Bash(head:*)",
+                "Bash(tail:*)",
+                "Bash(wc:*)",
+                "Bash(python:*)",
+                "Bash(echo:*)",
+                "Bash(mkdir:*)",
+                "Bash(cp:*)",
+                "Bash(mv:*)",
+            ],
+            deny=[
+                # Dangerous bash commands
+                "Bash(rm -rf:*)",
+                "Bash(sudo:*)",
+                "Bash(chmod 777:*)",
+                "Bash(curl|wget -O:*)",
+                # Sensitive file patterns
+                "Read(./.env)",
+                "Read(./secrets/**)",
+                "Read(**/.env*)",
+                "Read(**/secrets/**)",
+                "Write(./.env)",
+                "Write(./secrets/**)",
+                "Edit(./.env)",
+                "Edit(./secrets/**)",
+            ],
+            ask=[
+                # Potentially impactful operations that need confirmation
+                "Bash(git push:*)",
+                "Bash(git reset:*)",
+                "Bash(npm publish:*)",
+                "Bash(docker:*)",
+            ]
+        ),
+        tools=ToolsConfig(
+            enabled=[
+                "Bash", "Read", "Write", "Edit", "MultiEdit",
+                "Grep", "Glob", "LS", "Task", "Skill",
+                "TodoRead", "TodoWrite"
+            ],
+            disabled=[
+                # Disabled by default, enable as needed
+                # "WebFetch",
+                # "WebSearch",
+                # "NotebookEdit",
+                # "Agent",
+            ]
+        ),
+        allowedTools=[
             "Bash", "Read", "Write", "Edit", "MultiEdit",
-            "Grep", "Glob", "LS", "Task", "Skill",
-            "TodoRead", "TodoWrite"
-        ],
-        disabled=[
-            # Disabled by default, enable as needed
-            # "WebFetch",
-            # "WebSearch",
-            # "NotebookEdit",
-            # "Agent",
+            "Grep", "Glob", "LS", "Task", "Skill"
         ]
-    ),
-    allowedTools=[
-        "Bash", "Read", "Write", "Edit", "MultiEdit",
-        "Grep", "Glob", "LS", "Task", "Skill"
-    ]
-)
+    )
+
+
+def _dump_config(config: PermissionConfig) -> bytes:
+    """Serialize a permission config the way it is written to disk."""
+    return json.dumps(config.model_dump(mode="json"), indent=2).encode("utf-8")
+
+
+@functools.cache
+def _default_permission_config_json() -> bytes:
+    """Get the serialized default configuration, built on first use."""
+    return _dump_config(default_permission_config())
+
+
+def _write_config_file(target_path: Path, data: bytes) -> None:
+    """
+    Write a config file atomically.
+
+    The data goes to a temp file that is then swapped in, so a concurrent
+    hot-reload never reads a partially written file.
+    """
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target_path.with_name(target_path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, target_path)
+
+
+# Legacy module constants, resolved lazily through __getattr__
+_LAZY_CONSTANTS: dict[str, Callable[[], Any]] = {
+    "AVAILABLE_TOOLS": available_tools,
+    "SAFE_TOOLS": lambda: list(safe_tools()),
+    "DANGEROUS_TOOLS": lambda: list(dangerous_tools()),
+    "DEFAULT_PERMISSION_CONFIG": default_permission_config,
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve AVAILABLE_TOOLS and the other legacy constants on access."""
+    factory = _LAZY_CONSTANTS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
+
+
+# Tools whose argument is a file path, matched via _matches_path_pattern
+_PATH_TOOLS = frozenset({"Read", "Write", "Edit", "MultiEdit", "Glob", "Grep"})
+
+# Path patterns that match every path
+_MATCH_ALL = frozenset({"*", "**"})
+
+# Compound/piped Bash command markers: &&, ||, ;, |, $(), backticks
+_COMPOUND_RE = re.compile(r" && | \|\| | ; | \| |\$\(|`")
+
+# Bound regex match function of a compiled glob
+_Matcher = Callable[[str], Optional[re.Match[str]]]
+
+# File-name predicate of a compiled file glob
+_NameMatcher = Callable[[str], bool]
+
+# File globs that reduce to a plain suffix ("*.py")
+_EXTENSION_GLOB_RE = re.compile(r"\*(\.[A-Za-z0-9]+)")
+
+
+class _RuleAlternation:
+    """
+    Glob rules compiled into one regex with a named group per rule.
+
+    A single match both decides the bucket and, via the group name of the
+    alternative that fired, identifies the rule for logging.
+    """
+
+    __slots__ = ("regex", "rules")
+
+    def __init__(self, rules: list[str], globs: list[str]) -> None:
+        self.rules = rules
+        self.regex = re.compile("|".join(
+            f"(?P<r{i}>{fnmatch.translate(glob)})" for i, glob in enumerate(globs)
+        ))
+
+    def match(self, text: str) -> Optional[str]:
+        """Return the first rule whose glob matches text, or None."""
+        m = self.regex.match(text)
+        if m is None:
+            return None
+        return self.rules[int(m.lastgroup[1:])]
+
+
+def _has_glob_chars(pattern: str) -> bool:
+    """Check if a pattern contains fnmatch metacharacters."""
+    return "*" in pattern or "?" in pattern or "[" in pattern
+
+
+def _split_glob_pattern(pattern: str) -> tuple[str, Optional[str]]:
+    """
+    Split a glob pattern into directory portion and file glob.
+
+    Examples:
+        "./skills/**/*.py" -> ("./skills", "*.py")
+        "./skills/**" -> ("./skills", None)
+        "./src/*.txt" -> ("./src", "*.txt")
+        "./data" -> ("./data", None)
+
+    Args:
+        pattern: The glob pattern to split.
+
+    Returns:
+        Tuple of (directory_path, file_glob or None).
+    """
+    # Plain directory paths like "./data" need no splitting
+    if "*" not in pattern:
+        return pattern.rstrip("/") or ".", None
+
+    # Check if pattern ends with a file glob (e.g., *.py, *.txt)
+    # Look for patterns like **/*.py or *.py at the end. Segments are found
+    # by index so no intermediate list of parts is built.
+    last_slash = pattern.rfind("/")
+    last_part = pattern[last_slash + 1:]
+
+    # If last part is a file glob (starts with * and has extension)
+    # Examples: *.py, *.txt, *.json
+    if last_part.startswith("*") and "." in last_part and last_part != "**":
+        if last_slash == -1:
+            return ".", last_part
+
+        # Remove the file glob from the path, and a trailing ** if present
+        dir_pattern = pattern[:last_slash]
+        prev_slash = dir_pattern.rfind("/")
+        if dir_pattern[prev_slash + 1:] == "**":
+            if prev_slash == -1:
+                return ".", last_part
+            dir_pattern = dir_pattern[:prev_slash]
+        return dir_pattern, last_part
+
+    # If last part is just **, it matches everything under the directory
+    if last_part == "**":
+        dir_pattern = pattern[:last_slash] if last_slash != -1 else "."
+        return dir_pattern, None
+
+    # No glob pattern - the whole thing is a directory path
+    # Strip any trailing * that might be there
+    clean_pattern = pattern.rstrip("*").rstrip("/")
+    return clean_pattern if clean_pattern else ".", None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_file_glob(file_glob: str) -> _NameMatcher:
+    """
+    Compile a file-name glob (e.g. "*.py") into a predicate.
+
+    Extension globs like "*.py" become a plain endswith() test; anything
+    else is translated to a regex.
+
+    This does not depend on the filesystem or the working directory, so it
+    is shared by all rules using the same glob.
+    """
+    m = _EXTENSION_GLOB_RE.fullmatch(file_glob)
+    if m is not None:
+        suffix = m.group(1)
+        return lambda name: name.endswith(suffix)
+    match = re.compile(fnmatch.translate(file_glob)).match
+    return lambda name: match(name) is not None
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_path_pattern(
+    pattern: str,
+    resolve_base: str
+) -> tuple[str, Optional[_NameMatcher]]:
+    """
+    Split a path pattern into its base directory and file glob matcher.
+
+    Cached per (pattern, resolve_base). Only the lexical work is cached:
+    the base directory is joined with resolve_base but not resolved, since
+    it may be replaced by a symlink between checks. Nothing here depends
+    on the filesystem, so the cache never needs clearing. Paths are handled
+    as strings; no Path objects are built.
+
+    Args:
+        pattern: The permission pattern (may use ./ for relative).
+        resolve_base: Directory relative patterns are resolved against.
+
+    Returns:
+        Tuple of (unresolved absolute base directory, compiled file-name
+        predicate or None).
+    """
+    # Extract directory portion and file pattern from the pattern
+    # e.g., "./skills/**/*.py" -> base="./skills", file_glob="*.py"
+    # e.g., "./skills/**" -> base="./skills", file_glob=None
+    dir_pattern, file_glob = _split_glob_pattern(pattern)
+
+    # "./x", "../x" and bare "x" are all relative to resolve_base; only the
+    # "./" prefix is stripped before joining.
+    if dir_pattern[:1] == "/":
+        base_dir = dir_pattern
+    elif dir_pattern[:2] == "./":
+        base_dir = os.path.join(resolve_base, dir_pattern[2:])
+    else:
+        base_dir = os.path.join(resolve_base, dir_pattern)
+
+    file_match = _compile_file_glob(file_glob) if file_glob else None
+    return base_dir, file_match
+
+
+def _path_matches(resolved_path: str, pattern: str, resolve_base: str) -> bool:
+    """
+    Check if an already-resolved file path matches a path pattern.
+
+    Supports glob patterns like:
+    - ./skills/** (all files under skills/)
+    - ./skills/**/*.py (all .py files under skills/)
+    - ./src/*.txt (all .txt files directly in src/)
+
+    Args:
+        resolved_path: Absolute, symlink-resolved file path.
+        pattern: The permission pattern (may use ./ for relative).
+        resolve_base: Directory relative patterns are resolved against.
+
+    Returns:
+        True if path matches pattern.
+    """
+    # Handle special case: ** alone means "match everything"
+    if pattern in _MATCH_ALL:
+        return True
+
+    base_dir, file_match = _compile_path_pattern(pattern, resolve_base)
+
+    # Resolve the base on every check, like the file path, so both see the
+    # same state of any symlinks. The root directory "/" already ends with
+    # the separator.
+    base_prefix = os.path.realpath(base_dir).rstrip("/") + "/"
+
+    # Check if file is under the allowed directory. Both paths are
+    # normalized, so a prefix test on a "/" boundary is exact.
+    if not (resolved_path + "/").startswith(base_prefix):
+        return False
+
+    # If there's a file glob pattern (like *.py), check if file matches
+    if file_match is not None:
+        return file_match(os.path.basename(resolved_path))
+
+    return True
+
+
+# Parsed configs keyed by file path, tagged with the (mtime_ns, size) they
+# were parsed from. Configs are frozen, so managers can share one instance.
+_PARSED_CONFIGS: dict[Path, tuple[tuple[int, int], PermissionConfig]] = {}
+
+
+@dataclass(slots=True, frozen=True)
+class _BashRule:
+    """
+    A Bash permission pattern pre-split into the parts matched per command.
+
+    For "Bash(python ./skills/**)": executable matches "python",
+    path_pattern is "./skills/**" and command_match is the whole pattern as
+    a glob (used when the command has no second word to match the path
+    against). rule keeps the original entry for logging.
+    """
+
+    rule: str
+    executable: _Matcher
+    single: bool
+    path_pattern: Optional[str]
+    command_match: _Matcher
+
+    @classmethod
+    def compile(cls, rule: str, pattern: str) -> Optional["_BashRule"]:
+        """Compile a Bash rule's pattern, or return None if it can never match."""
+        pattern_parts = pattern.split()
+        if not pattern_parts:
+            return None
+
+        path_pattern = None
+        if len(pattern_parts) > 1:
+            candidate = pattern_parts[1]
+            # Check if pattern contains a path glob (like ./skills/**)
+            if "./" in candidate or "/" in candidate or "**" in candidate:
+                path_pattern = candidate
+
+        glob = pattern.replace(":*", "*").replace("**", "*")
+        return cls(
+            rule=rule,
+            executable=re.compile(fnmatch.translate(pattern_parts[0])).match,
+            single=len(pattern_parts) == 1,
+            path_pattern=path_pattern,
+            command_match=re.compile(fnmatch.translate(glob)).match,
+        )
+
+
+class _CompiledRules:
+    """
+    One bucket of permission rules (allow, deny or ask) compiled for matching.
+
+    Tool-name-only rules without wildcards ("Grep", "LS") go into a set for
+    exact lookup; the remaining ones ("Todo*") are compiled once into a
+    _RuleAlternation matched against the tool name. Rules for other
+    non-path tools are split the same way per tool: literal arguments
+    ("WebFetch(domain:example.com)") into a dict, globs ("Skill(test:*)")
+    into one alternation matched against the call argument. Bash rules are
+    pre-split into _BashRule entries. Path rules depend on the working
+    directory, so only their argument pattern is bucketed by tool name; a
+    check only scans the rules of its own tool.
+    """
+
+    __slots__ = ("name_literals", "names", "arg_literals", "globs", "paths", "bash")
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        name_literals: set[str] = set()
+        name_rules: list[str] = []
+        self.arg_literals: dict[str, dict[str, str]] = {}
+        glob_rules: dict[str, tuple[list[str], list[str]]] = {}
+        self.paths: dict[str, list[tuple[str, str]]] = {}
+        self.bash: list[_BashRule] = []
+
+        for pattern in patterns:
+            if "(" not in pattern:
+                if _has_glob_chars(pattern):
+                    name_rules.append(pattern)
+                else:
+                    name_literals.add(pattern)
+                continue
+            tool_name, _, rest = pattern.partition("(")
+            tool_name = sys.intern(tool_name)
+            pattern_arg = rest[:-1]  # Remove trailing ")"
+            if tool_name == "Bash":
+                bash_rule = _BashRule.compile(pattern, pattern_arg)
+                if bash_rule is not None:
+                    self.bash.append(bash_rule)
+                continue
+            if tool_name in _PATH_TOOLS:
+                path_rules = self.paths.setdefault(tool_name, [])
+                # Rules after a match-all pattern can never be reached
+                if not (path_rules and path_rules[-1][0] in _MATCH_ALL):
+                    path_rules.append((pattern_arg, pattern))
+                continue
+            pattern_arg = pattern_arg.replace(":*", "*").replace("**", "*")
+            if _has_glob_chars(pattern_arg):
+                rules, globs = glob_rules.setdefault(tool_name, ([], []))
+                rules.append(pattern)
+                globs.append(pattern_arg)
+            else:
+                self.arg_literals.setdefault(tool_name, {}).setdefault(
+                    pattern_arg, pattern
+                )
+
+        self.name_literals = frozenset(name_literals)
+        self.names = (
+            _RuleAlternation(name_rules, name_rules) if name_rules else None
+        )
+        self.globs = {
+            tool_name: _RuleAlternation(rules, globs)
+            for tool_name, (rules, globs) in glob_rules.items()
+        }
 
 
 class PermissionConfigManager:
@@ -530,11 +922,14 @@ class PermissionConfigManager:
 
     CONFIG_FILENAME = "permissions.json"
     CLAUDE_SETTINGS_FILENAME = "settings.local.json"
+    # Maximum number of remembered denials (oldest are evicted first)
+    DENIAL_CACHE_SIZE = 2048
 
     def __init__(
         self,
         config_path: Optional[Path] = None,
-        project_dir: Optional[Path] = None
+        project_dir: Optional[Path] = None,
+        poll_interval_s: float = 0.5
     ) -> None:
         """
         Initialize the permission configuration manager.
@@ -542,13 +937,39 @@ class PermissionConfigManager:
         Args:
             config_path: Direct path to permissions.json config file.
             project_dir: Project directory for .claude/settings.local.json.
+            poll_interval_s: Minimum seconds between config file stat checks
+                for hot-reloading. Use 0 to check on every load.
         """
         self._config_path = config_path
         self._project_dir = project_dir
         self._config: Optional[PermissionConfig] = None
-        self._last_modified: Optional[float] = None
+        # (file, mtime_ns, size) of the config file the config was loaded from
+        self._file_state: Optional[tuple[Path, int, int]] = None
+        # Set by use_config(): keep an in-memory config, skip file reloads
+        self._pinned = False
+        self._poll_interval_s = poll_interval_s
+        self._last_stat_check = 0.0
         # Working directory for resolving relative paths in permission matching
         self._working_directory: Optional[Path] = None
+        # String form of the directory relative paths are resolved against
+        self._resolve_base = str(AGENT_DIR)
+        # Rules and tool lists compiled from the config object they were
+        # built for; the version is bumped on every recompile
+        self._compiled_for: Optional[PermissionConfig] = None
+        self._config_version = 0
+        self._allow_rules: Optional[_CompiledRules] = None
+        self._deny_rules: Optional[_CompiledRules] = None
+        self._ask_rules: Optional[_CompiledRules] = None
+        self._enabled_tools: frozenset[str] = frozenset()
+        self._enabled_list: tuple[str, ...] = ()
+        self._sdk_tools: tuple[str, ...] = ()
+        self._allow_index: dict[str, list[str]] = {}
+        self._deny_index: dict[str, list[str]] = {}
+        self._allow_alternations: dict[str, Optional[_RuleAlternation]] = {}
+        self._settings_sections: Optional[tuple[dict[str, Any], dict[str, Any]]] = None
+        # Denied tool calls mapped to the config version that denied them.
+        # Only denials are cached: a stale entry can only fail closed.
+        self._denial_cache: OrderedDict[str, int] = OrderedDict()
 
     def set_working_directory(self, working_dir: Path) -> None:
         """
@@ -561,11 +982,15 @@ class PermissionConfigManager:
             working_dir: Absolute path to the working directory.
         """
         self._working_directory = working_dir.resolve()
+        self._resolve_base = str(self._working_directory)
+        self._denial_cache.clear()
         logger.debug(f"Permission working directory set to: {self._working_directory}")
 
     def clear_working_directory(self) -> None:
         """Clear the working directory, reverting to AGENT_DIR for path resolution."""
         self._working_directory = None
+        self._resolve_base = str(AGENT_DIR)
+        self._denial_cache.clear()
         logger.debug("Permission working directory cleared")
 
     def _find_config_file(self) -> Optional[Path]:
@@ -606,16 +1031,25 @@ class PermissionConfigManager:
         return None
 
     def _needs_reload(self) -> bool:
-        """Check if configuration file has been modified since last load."""
+        """Check if the configuration file changed since last load."""
+        if self._pinned:
+            return False
+
+        if self._config is not None:
+            # Throttle stat() calls during bursts of permission checks
+            now = time.monotonic()
+            if now - self._last_stat_check < self._poll_interval_s:
+                return False
+            self._last_stat_check = now
+
         config_file = self._find_config_file()
         if config_file is None:
             return self._config is None
 
-        current_mtime = config_file.stat().st_mtime
-        if self._last_modified is None:
-            return True
-
-        return current_mtime > self._last_modified
+        # Any change of file, mtime or size counts, including a file
+        # restored with an older mtime
+        stat = config_file.stat()
+        return (config_file, stat.st_mtime_ns, stat.st_size) != self._file_state
 
     def load(self, force: bool = False) -> PermissionConfig:
         """
@@ -633,28 +1067,37 @@ class PermissionConfigManager:
         if not force and self._config is not None and not self._needs_reload():
             return self._config
 
+        self._pinned = False
+
         config_file = self._find_config_file()
 
         if config_file is None:
             logger.debug("No config file found, using defaults")
-            self._config = DEFAULT_PERMISSION_CONFIG.model_copy(deep=True)
+            self._config = default_permission_config()
             return self._config
 
         try:
-            with config_file.open("r", encoding="utf-8") as f:
-                config_data = json.load(f)
-
-            self._config = PermissionConfig.model_validate(config_data)
-            self._last_modified = config_file.stat().st_mtime
-            logger.info(f"Loaded permission config from {config_file}")
+            stat = config_file.stat()
+            file_key = (stat.st_mtime_ns, stat.st_size)
+            cached = _PARSED_CONFIGS.get(config_file)
+            if not force and cached is not None and cached[0] == file_key:
+                self._config = cached[1]
+            else:
+                # json accepts UTF-8 bytes directly, skipping a text wrapper
+                config_data = json.loads(config_file.read_bytes())
+                self._config = PermissionConfig.model_validate(config_data)
+                _PARSED_CONFIGS[config_file] = (file_key, self._config)
+                logger.info(f"Loaded permission config from {config_file}")
+
+            self._file_state = (config_file, stat.st_mtime_ns, stat.st_size)
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse {config_file}: {e}")
-            self._config = DEFAULT_PERMISSION_CONFIG.model_copy(deep=True)
+            self._config = default_permission_config()
 
         except Exception as e:
             logger.error(f"Failed to load {config_file}: {e}")
-            self._config = DEFAULT_PERMISSION_CONFIG.model_copy(deep=True)
+            self._config = default_permission_config()
 
         return self._config
 
@@ -662,6 +1105,101 @@ class PermissionConfigManager:
         """Force reload configuration from file."""
         return self.load(force=True)
 
+    def use_config(self, config: PermissionConfig) -> None:
+        """
+        Use an in-memory configuration instead of the config files.
+
+        The config stays in effect until reload() is called; changes to
+        config files are not picked up in the meantime.
+
+        Args:
+            config: Configuration to use, e.g. built from a profile.
+        """
+        self._config = config
+        self._config_path = None
+        self._file_state = None
+        self._pinned = True
+
+    def _compile_rules(self, config: PermissionConfig) -> None:
+        """
+        Compile rules, per-tool pattern indexes and tool lists for a config.
+
+        Results are keyed on the config object itself, so any reload (or a
+        config assigned by a profile manager) triggers a recompile and bumps
+        _config_version.
+        """
+        if self._compiled_for is config:
+            return
+        self._allow_rules = _CompiledRules(config.permissions.allow)
+        self._deny_rules = _CompiledRules(config.permissions.deny)
+        self._ask_rules = _CompiledRules(config.permissions.ask)
+        self._enabled_tools = (
+            frozenset(config.tools.enabled or available_tools())
+            - frozenset(config.tools.disabled)
+        )
+        self._enabled_list = tuple(self._enabled_tools)
+        self._sdk_tools = tuple(config.allowedTools) or self._enabled_list
+        self._allow_index = index_patterns_by_tool(config.permissions.allow)
+        self._deny_index = index_patterns_by_tool(config.permissions.deny)
+        self._allow_alternations = {}
+        self._settings_sections = None
+        self._compiled_for = config
+        self._config_version += 1
+
+    def _match_rule(
+        self,
+        tool_call: str,
+        rules: _CompiledRules
+    ) -> Optional[str]:
+        """
+        Find the rule of a compiled bucket that matches a tool call.
+
+        Args:
+            tool_call: The actual tool call string.
+            rules: Compiled allow, deny or ask rules.
+
+        Returns:
+            The matching rule as written in the config, or None.
+        """
+        tool_name, _, rest = tool_call.partition("(")
+        if tool_name in rules.name_literals:
+            return tool_name
+        if rules.names is not None:
+            rule = rules.names.match(tool_name)
+            if rule is not None:
+                return rule
+
+        tool_arg = rest[:-1]  # Remove trailing ")"
+        literals = rules.arg_literals.get(tool_name)
+        if literals is not None:
+            rule = literals.get(tool_arg)
+            if rule is not None:
+                return rule
+        globs = rules.globs.get(tool_name)
+        if globs is not None:
+            rule = globs.match(tool_arg)
+            if rule is not None:
+                return rule
+
+        if tool_name == "Bash":
+            if not rules.bash:
+                return None
+            return self._match_bash_rule(tool_arg, rules.bash)
+
+        path_rules = rules.paths.get(tool_name)
+        if not path_rules:
+            return None
+        if path_rules[0][0] in _MATCH_ALL:
+            # Matches any path, so there is nothing to resolve
+            return path_rules[0][1]
+
+        # Resolve the file once for all path rules of this tool
+        resolved_path, resolve_base = self._resolve_tool_path(tool_arg)
+        for pattern_arg, rule in path_rules:
+            if _path_matches(resolved_path, pattern_arg, resolve_base):
+                return rule
+        return None
+
     def save(self, target_path: Optional[Path] = None) -> Path:
         """
         Save current configuration to file.
@@ -675,32 +1213,30 @@ class PermissionConfigManager:
         if target_path is None:
             target_path = CONFIG_DIR / self.CONFIG_FILENAME
 
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-
-        config = self._config or DEFAULT_PERMISSION_CONFIG
-        with target_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                config.model_dump(mode="json"),
-                f,
-                indent=2
-            )
+        config = self._config or default_permission_config()
+        if config is default_permission_config():
+            data = _default_permission_config_json()
+        else:
+            data = _dump_config(config)
+        _write_config_file(target_path, data)
 
         logger.info(f"Saved permission config to {target_path}")
         return target_path
 
     def get_enabled_tools(self) -> list[str]:
         """Get list of enabled tools based on configuration."""
-        config = self.load()
-        enabled = set(config.tools.enabled or list(AVAILABLE_TOOLS.keys()))
-        disabled = set(config.tools.disabled)
-        return list(enabled - disabled)
+        self._compile_rules(self.load())
+        return list(self._enabled_list)
+
+    def is_tool_enabled(self, tool_name: str) -> bool:
+        """Check if a tool is enabled and not disabled by configuration."""
+        self._compile_rules(self.load())
+        return tool_name in self._enabled_tools
 
     def get_allowed_tools_for_sdk(self) -> list[str]:
         """Get list of allowed tools in SDK format."""
-        config = self.load()
-        if config.allowedTools:
-            return config.allowedTools
-        return self.get_enabled_tools()
+        self._compile_rules(self.load())
+        return list(self._sdk_tools)
 
     def is_tool_allowed(self, tool_call: str) -> bool:
         """
@@ -721,28 +1257,42 @@ class PermissionConfigManager:
             True if allowed, False if denied.
         """
         config = self.load()
+        self._compile_rules(config)
+
+        # Agents tend to retry denied calls; skip matching for known denials
+        if self._denial_cache.get(tool_call) == self._config_version:
+            return False
 
         # SECURITY: Check deny rules FIRST - explicit denies always win
         # This prevents broad allow patterns like Bash(*) from defeating
         # specific deny patterns like Bash(ps *) or Bash(kill *)
-        for pattern in config.permissions.deny:
-            if self._matches_pattern(tool_call, pattern):
-                logger.debug(f"Tool {tool_call} denied by pattern {pattern}")
-                return False
+        rule = self._match_rule(tool_call, self._deny_rules)
+        if rule is not None:
+            logger.debug(f"Tool {tool_call} denied by rule {rule}")
+            self._remember_denial(tool_call)
+            return False
 
         # Check allow rules - if not denied, check if explicitly allowed
-        for pattern in config.permissions.allow:
-            if self._matches_pattern(tool_call, pattern):
-                logger.debug(f"Tool {tool_call} allowed by pattern {pattern}")
-                return True
+        rule = self._match_rule(tool_call, self._allow_rules)
+        if rule is not None:
+            logger.debug(f"Tool {tool_call} allowed by rule {rule}")
+            return True
 
         # Default behavior based on mode
         if config.defaultMode == PermissionMode.BYPASS:
             return True
 
         # Default to denied for security
+        self._remember_denial(tool_call)
         return False
 
+    def _remember_denial(self, tool_call: str) -> None:
+        """Cache a denied tool call for the current config version."""
+        self._denial_cache[tool_call] = self._config_version
+        self._denial_cache.move_to_end(tool_call)
+        if len(self._denial_cache) > self.DENIAL_CACHE_SIZE:
+            self._denial_cache.popitem(last=False)
+
     def needs_confirmation(self, tool_call: str) -> bool:
         """
         Check if a tool call requires user confirmation.
@@ -753,65 +1303,16 @@ class PermissionConfigManager:
         Returns:
             True if confirmation needed.
         """
-        config = self.load()
-
-        for pattern in config.permissions.ask:
-            if self._matches_pattern(tool_call, pattern):
-                return True
-
-        return False
-
-    def _matches_pattern(self, tool_call: str, pattern: str) -> bool:
-        """
-        Check if a tool call matches a permission pattern.
-
-        Patterns support:
-        - Exact match: "Bash" matches "Bash"
-        - Glob patterns: "Bash(git:*)" matches "Bash(git commit -m 'test')"
-        - File patterns: "Read(./src/**)" matches "Read(./src/foo/bar.py)"
-        - Relative patterns are resolved against AGENT_DIR
-
-        Args:
-            tool_call: The actual tool call string.
-            pattern: The permission pattern.
-
-        Returns:
-            True if tool_call matches pattern.
-        """
-        # Handle case where pattern has no parentheses (tool name only)
-        if "(" not in pattern:
-            # Match just the tool name
-            tool_name = tool_call.split("(")[0] if "(" in tool_call else tool_call
-            return fnmatch.fnmatch(tool_name, pattern)
-
-        # Extract tool name and argument from both
-        tool_name = tool_call.split("(")[0]
-        pattern_name = pattern.split("(")[0]
-
-        # Tool names must match
-        if tool_name != pattern_name:
-            return False
+        self._compile_rules(self.load())
+        return self._match_rule(tool_call, self._ask_rules) is not None
 
-        # Extract the path/argument from the tool call and pattern
-        tool_arg = tool_call[len(tool_name) + 1:-1]  # Remove "ToolName(" and ")"
-        pattern_arg = pattern[len(pattern_name) + 1:-1]  # Remove "ToolName(" and ")"
-
-        # For file operations and search, normalize paths for matching
-        if tool_name in ("Read", "Write", "Edit", "MultiEdit", "Glob", "Grep"):
-            return self._matches_path_pattern(tool_arg, pattern_arg)
-
-        # For Bash commands with file paths (e.g., "python ./skills/**")
-        # Extract the path from the command and match against pattern
-        if tool_name == "Bash":
-            return self._matches_bash_pattern(tool_arg, pattern_arg)
-
-        # For other tools, use standard glob matching
-        fnmatch_pattern = pattern_arg.replace(":*", "*").replace("**", "*")
-        return fnmatch.fnmatch(tool_arg, fnmatch_pattern)
-
-    def _matches_bash_pattern(self, command: str, pattern: str) -> bool:
+    def _match_bash_rule(
+        self,
+        command: str,
+        rules: list[_BashRule]
+    ) -> Optional[str]:
         """
-        Check if a Bash command matches a permission pattern.
+        Find the compiled Bash rule that matches a command.
 
         Handles commands with file paths like "python ./skills/**" by
         normalizing paths against AGENT_DIR.
@@ -824,65 +1325,43 @@ class PermissionConfigManager:
 
         Args:
             command: The actual Bash command string.
-            pattern: The permission pattern.
+            rules: Compiled Bash rules.
 
         Returns:
-            True if command matches pattern.
+            The matching rule as written in the config, or None.
         """
         # Deny compound commands entirely for security
-        # Commands with &&, ||, ;, |, $(), ``, etc. are not allowed
-        if any(op in command for op in [" && ", " || ", " ; ", " | ", "$(", "`"]):
+        # Commands with &&, ||, ;, |, $(), ``, etc. are not allowed.
+        # One scan covers every rule.
+        if _COMPOUND_RE.search(command):
             logger.debug(f"Compound/piped command denied: '{command[:50]}...'")
-            return False
-
-        return self._matches_simple_bash_pattern(command, pattern)
+            return None
 
-    def _matches_simple_bash_pattern(self, command: str, pattern: str) -> bool:
-        """
-        Check if a simple (non-compound) Bash command matches a pattern.
-
-        Args:
-            command: Simple Bash command string.
-            pattern: Permission pattern.
-
-        Returns:
-            True if command matches pattern.
-        """
-        # Split command and pattern into parts
         command_parts = command.split()
-        pattern_parts = pattern.split()
-
-        if not command_parts or not pattern_parts:
-            return False
+        if not command_parts:
+            return None
 
         # First part is the executable (python, python3, etc.)
         cmd_executable = command_parts[0]
-        pattern_executable = pattern_parts[0]
-
-        # Executable must match (or pattern can use * wildcard)
-        if not fnmatch.fnmatch(cmd_executable, pattern_executable):
-            return False
-
-        # If pattern has a path component, match it
-        if len(pattern_parts) > 1 and len(command_parts) > 1:
-            pattern_path = pattern_parts[1]
-            cmd_path = command_parts[1]
-
-            # Check if pattern contains a path glob (like ./skills/**)
-            if "./" in pattern_path or "/" in pattern_path or "**" in pattern_path:
-                return self._matches_path_pattern(cmd_path, pattern_path)
-
-        # Handle wildcard pattern like "python *" or bare "python"
-        if len(pattern_parts) == 1 and pattern_parts[0].endswith("*"):
-            return True
-
-        # If pattern is just the executable and command has more args
-        if len(pattern_parts) == 1 and len(command_parts) >= 1:
-            return fnmatch.fnmatch(cmd_executable, pattern_executable)
-
-        # Fall back to standard glob matching for non-path patterns
-        fnmatch_pattern = pattern.replace(":*", "*").replace("**", "*")
-        return fnmatch.fnmatch(command, fnmatch_pattern)
+        for rule in rules:
+            # Executable must match (or pattern can use * wildcard)
+            if not rule.executable(cmd_executable):
+                continue
+
+            # If pattern has a path component, match it
+            if rule.path_pattern is not None and len(command_parts) > 1:
+                if self._matches_path_pattern(command_parts[1], rule.path_pattern):
+                    return rule.rule
+                continue
+
+            # Bare executable patterns like "python" or "py*" match any args
+            if rule.single:
+                return rule.rule
+
+            # Fall back to standard glob matching for non-path patterns
+            if rule.command_match(command):
+                return rule.rule
+        return None
 
     def _matches_path_pattern(self, file_path: str, pattern: str) -> bool:
         """
@@ -890,11 +1369,8 @@ class PermissionConfigManager:
 
         Handles both absolute and relative paths by resolving
         relative paths against the working directory (if set) or AGENT_DIR.
-
-        Supports glob patterns like:
-        - ./skills/** (all files under skills/)
-        - ./skills/**/*.py (all .py files under skills/)
-        - ./src/*.txt (all .txt files directly in src/)
+        The file path is resolved on every call, and the result is not
+        memoized, because symlinks may change between calls.
 
         Args:
             file_path: The actual file path (may be absolute or relative).
@@ -903,108 +1379,50 @@ class PermissionConfigManager:
         Returns:
             True if path matches pattern.
         """
-        # Determine the base directory for resolving relative paths
-        # Use working directory if set, otherwise AGENT_DIR
-        resolve_base = self._working_directory or AGENT_DIR
+        resolved_path, resolve_base = self._resolve_tool_path(file_path)
+        return _path_matches(resolved_path, pattern, resolve_base)
 
-        # Normalize the file path to absolute
-        if not file_path.startswith("/"):
-            file_path = str(resolve_base / file_path)
-        file_path_obj = Path(file_path).resolve()
-
-        # Handle special case: ** alone means "match everything"
-        if pattern == "**" or pattern == "*":
-            return True
-
-        # Extract directory portion and file pattern from the pattern
-        # e.g., "./skills/**/*.py" -> base="./skills", file_glob="*.py"
-        # e.g., "./skills/**" -> base="./skills", file_glob=None
-        dir_pattern, file_glob = self._split_glob_pattern(pattern)
-
-        # Resolve the directory pattern to an absolute path
-        if dir_pattern.startswith("./"):
-            base_dir = resolve_base / dir_pattern[2:]
-        elif dir_pattern.startswith("../"):
-            base_dir = (resolve_base / dir_pattern).resolve()
-        elif not dir_pattern.startswith("/"):
-            # Relative path without ./ - treat as relative to resolve_base
-            base_dir = resolve_base / dir_pattern
-        else:
-            base_dir = Path(dir_pattern)
-
-        # Check if file is under the allowed directory
-        try:
-            file_path_obj.relative_to(base_dir.resolve())
-        except ValueError:
-            # file_path is not under base_dir
-            return False
-
-        # If there's a file glob pattern (like *.py), check if file matches
-        if file_glob:
-            return fnmatch.fnmatch(file_path_obj.name, file_glob)
-
-        return True
-
-    def _split_glob_pattern(self, pattern: str) -> tuple[str, Optional[str]]:
+    def _resolve_tool_path(self, file_path: str) -> tuple[str, str]:
         """
-        Split a glob pattern into directory portion and file glob.
+        Resolve a tool's file path to an absolute, symlink-free path.
 
-        Examples:
-            "./skills/**/*.py" -> ("./skills", "*.py")
-            "./skills/**" -> ("./skills", None)
-            "./src/*.txt" -> ("./src", "*.txt")
-            "./data" -> ("./data", None)
+        Relative paths are resolved against the working directory (if set)
+        or AGENT_DIR. Symlinks are always followed so that a link inside an
+        allowed directory cannot point a rule at files outside it.
 
         Args:
-            pattern: The glob pattern to split.
+            file_path: The actual file path (may be absolute or relative).
 
         Returns:
-            Tuple of (directory_path, file_glob or None).
+            Tuple of (resolved file path, base directory for relative patterns).
         """
-        # Check if pattern ends with a file glob (e.g., *.py, *.txt)
-        # Look for patterns like **/*.py or *.py at the end
-        parts = pattern.split("/")
-
-        # Check the last part for file glob
-        last_part = parts[-1] if parts else ""
-
-        # If last part is a file glob (starts with * and has extension)
-        # Examples: *.py, *.txt, *.json
-        if last_part.startswith("*") and "." in last_part and last_part != "**":
-            file_glob = last_part
-            # Remove the file glob from the path
-            remaining_parts = parts[:-1]
-
-            # Also remove trailing ** if present
-            if remaining_parts and remaining_parts[-1] == "**":
-                remaining_parts = remaining_parts[:-1]
-
-            dir_pattern = "/".join(remaining_parts) if remaining_parts else "."
-            return dir_pattern, file_glob
-
-        # If last part is just **, it matches everything under the directory
-        if last_part == "**":
-            remaining_parts = parts[:-1]
-            dir_pattern = "/".join(remaining_parts) if remaining_parts else "."
-            return dir_pattern, None
-
-        # No glob pattern - the whole thing is a directory path
-        # Strip any trailing * that might be there
-        clean_pattern = pattern.rstrip("*").rstrip("/")
-        return clean_pattern if clean_pattern else ".", None
+        resolve_base = self._resolve_base
+        if not file_path.startswith("/"):
+            file_path = os.path.join(resolve_base, file_path)
+        return os.path.realpath(file_path), resolve_base
 
     def to_claude_settings(self) -> dict[str, Any]:
         """
         Convert configuration to Claude .claude/settings.local.json format.
 
+        The permissions and hooks sections are dumped once per config and
+        shared between calls, so callers must not modify them.
+
         Returns:
             Dictionary suitable for .claude/settings.local.json.
         """
         config = self.load()
+        self._compile_rules(config)
+        if self._settings_sections is None:
+            self._settings_sections = (
+                config.permissions.model_dump(mode="json"),
+                config.hooks.model_dump(mode="json"),
+            )
+        permissions, hooks = self._settings_sections
         return {
-            "permissions": config.permissions.model_dump(mode="json"),
+            "permissions": permissions,
             "defaultMode": config.defaultMode.value,
-            "hooks": config.hooks.model_dump(mode="json"),
+            "hooks": hooks,
         }
 
     def get_tools_by_category(
@@ -1012,14 +1430,11 @@ class PermissionConfigManager:
         category: ToolCategory
     ) -> list[ToolDefinition]:
         """Get all tools in a specific category."""
-        return [
-            tool for tool in AVAILABLE_TOOLS.values()
-            if tool.category == category
-        ]
+        return list(tools_by_category().get(category, ()))
 
     def get_tool_info(self, tool_name: str) -> Optional[ToolDefinition]:
         """Get information about a specific tool."""
-        return AVAILABLE_TOOLS.get(tool_name)
+        return available_tools().get(tool_name)
 
     def get_allowed_patterns_for_tool(self, tool_name: str) -> list[str]:
         """
@@ -1034,8 +1449,34 @@ class PermissionConfigManager:
         Returns:
             List of allowed patterns for the tool (e.g., ["python ./skills/**/*.py"]).
         """
-        config = self.load()
-        return extract_patterns_for_tool(tool_name, config.permissions.allow)
+        self._compile_rules(self.load())
+        return list(self._allow_index.get(tool_name, ()))
+
+    def matches_allow(self, tool_name: str, candidate: str) -> bool:
+        """
+        Check if a candidate matches any allowed pattern of a tool.
+
+        The patterns returned by get_allowed_patterns_for_tool are tested as
+        plain globs with a single match of one combined regex, compiled once
+        per tool and config. Unlike is_tool_allowed, deny rules and path
+        resolution are not applied; use get_allowed_patterns_for_tool when
+        the individual patterns are needed.
+
+        Args:
+            tool_name: Name of the tool (e.g., "Bash", "Read", "Write").
+            candidate: Argument to test, e.g. "git status".
+
+        Returns:
+            True if at least one allowed pattern matches.
+        """
+        self._compile_rules(self.load())
+        try:
+            alternation = self._allow_alternations[tool_name]
+        except KeyError:
+            patterns = self._allow_index.get(tool_name)
+            alternation = _RuleAlternation(patterns, patterns) if patterns else None
+            self._allow_alternations[tool_name] = alternation
+        return alternation is not None and alternation.match(candidate) is not None
 
     def get_denied_patterns_for_tool(self, tool_name: str) -> list[str]:
         """
@@ -1047,8 +1488,8 @@ class PermissionConfigManager:
         Returns:
             List of denied patterns for the tool.
         """
-        config = self.load()
-        return extract_patterns_for_tool(tool_name, config.permissions.deny)
+        self._compile_rules(self.load())
+        return list(self._deny_index.get(tool_name, ()))
 
 
 def create_default_permissions_file(
@@ -1067,22 +1508,24 @@ def create_default_permissions_file(
     if target_dir is None:
         target_dir = CONFIG_DIR
 
-    manager = PermissionConfigManager()
-    manager._config = DEFAULT_PERMISSION_CONFIG
-    return manager.save(target_dir / "permissions.json")
+    target_path = target_dir / PermissionConfigManager.CONFIG_FILENAME
+    _write_config_file(target_path, _default_permission_config_json())
+    logger.info(f"Saved permission config to {target_path}")
+    return target_path
 
 
-def get_all_tool_definitions() -> dict[str, ToolDefinition]:
-    """Get all available tool definitions."""
-    return AVAILABLE_TOOLS.copy()
+@functools.cache
+def get_all_tool_definitions() -> Mapping[str, ToolDefinition]:
+    """Get a read-only view of all available tool definitions."""
+    return MappingProxyType(available_tools())
 
 
-def get_safe_tools() -> list[str]:
-    """Get list of safe (read-only) tools."""
-    return SAFE_TOOLS.copy()
+def get_safe_tools() -> tuple[str, ...]:
+    """Get the safe (read-only) tools."""
+    return safe_tools()
 
 
-def get_dangerous_tools() -> list[str]:
-    """Get list of dangerous tools that modify state."""
-    return DANGEROUS_TOOLS.copy()
+def get_dangerous_tools() -> tuple[str, ...]:
+    """Get the dangerous tools that modify state."""
+    return dangerous_tools()
 
@@ -17,14 +17,24 @@ Usage:
     if manager.is_allowed("Read(/path/to/file)"):
         ...
 """
+import functools
+import glob
+import hashlib
 import json
 import logging
-import time
+import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional
 
-import yaml
-from pydantic import BaseModel, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    ValidationError,
+    field_validator,
+)
 
 from ..config import (
     AGENT_DIR,
@@ -34,7 +44,7 @@ from ..config import (
     SESSIONS_DIR,
     SKILLS_DIR,
 )
-from .tool_utils import extract_patterns_for_tool
+from .tool_utils import index_patterns_by_tool
 from .permission_config import (
     PermissionConfig,
     PermissionConfigManager,
@@ -50,62 +60,130 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Placeholder for the session workspace path in session_workspace patterns
+_WORKSPACE_PLACEHOLDER = "{workspace}"
+
+# Sandbox placeholders that do not depend on the session
+_STATIC_SANDBOX_PLACEHOLDERS = {
+    "agent_dir": str(AGENT_DIR),
+    "sessions_dir": str(SESSIONS_DIR),
+    "config_dir": str(CONFIG_DIR),
+    "skills_dir": str(SKILLS_DIR),
+    "logs_dir": str(LOGS_DIR),
+    "data_dir": str(DATA_DIR),
+}
+
+
+def _split_workspace_templates(
+    patterns: tuple[str, ...]
+) -> Optional[tuple[tuple[str, ...], ...]]:
+    """
+    Split patterns on the {workspace} placeholder.
+
+    Returns:
+        The literal parts of each pattern, to be joined with the workspace
+        path, or None if no pattern contains the placeholder.
+    """
+    if not any(_WORKSPACE_PLACEHOLDER in pattern for pattern in patterns):
+        return None
+    return tuple(tuple(pattern.split(_WORKSPACE_PLACEHOLDER)) for pattern in patterns)
+
 
 class ExtendedToolsConfig(BaseModel):
     """
     Extended tool configuration including permission checking settings.
     """
-    enabled: list[str] = Field(
-        default_factory=list,
+    model_config = ConfigDict(frozen=True)
+
+    enabled: tuple[str, ...] = Field(
+        default=(),
         description="List of enabled tools"
     )
-    disabled: list[str] = Field(
-        default_factory=list,
+    disabled: tuple[str, ...] = Field(
+        default=(),
         description="List of disabled tools"
     )
-    permission_checked: list[str] = Field(
-        default_factory=list,
+    permission_checked: tuple[str, ...] = Field(
+        default=(),
         description="""
 Tools that require permission callback checks.
 These tools are available but each use is validated against permission rules."""
     )
 
+    # Tool sets derived from the lists above, computed once per instance
+    _enabled_tools: tuple[str, ...] = PrivateAttr(default=())
+    _disabled_tools: frozenset[str] = PrivateAttr(default=frozenset())
+    _permission_checked_tools: frozenset[str] = PrivateAttr(default=frozenset())
+    _pre_approved_tools: tuple[str, ...] = PrivateAttr(default=())
+
     @field_validator("enabled", "disabled", "permission_checked", mode="before")
     @classmethod
-    def convert_none_to_list(cls, v: Any) -> list[str]:
-        """Convert None (from empty YAML values) to empty list."""
+    def convert_none_to_empty(cls, v: Any) -> Any:
+        """Convert None (from empty YAML values) to an empty tuple."""
         if v is None:
-            return []
+            return ()
         return v
 
+    def model_post_init(self, __context: Any) -> None:
+        """Precompute the tool sets used on every tool dispatch."""
+        enabled = frozenset(self.enabled)
+        self._disabled_tools = frozenset(self.disabled)
+        self._permission_checked_tools = frozenset(self.permission_checked)
+        self._enabled_tools = tuple(enabled - self._disabled_tools)
+        self._pre_approved_tools = tuple(
+            enabled - self._permission_checked_tools - self._disabled_tools
+        )
+
+    @property
+    def enabled_tools(self) -> tuple[str, ...]:
+        """Enabled tools that are not disabled."""
+        return self._enabled_tools
+
+    @property
+    def disabled_tools(self) -> frozenset[str]:
+        """Tools that cannot be used at all."""
+        return self._disabled_tools
+
+    @property
+    def permission_checked_tools(self) -> frozenset[str]:
+        """Tools whose every use is checked against permission rules."""
+        return self._permission_checked_tools
+
+    @property
+    def pre_approved_tools(self) -> tuple[str, ...]:
+        """Enabled tools that need no permission check."""
+        return self._pre_approved_tools
+
 
 class ExtendedPermissionRules(BaseModel):
     """
     Extended permission rules including allowed directories.
     """
-    allow: list[str] = Field(
-        default_factory=list,
+    model_config = ConfigDict(frozen=True)
+
+    allow: tuple[str, ...] = Field(
+        default=(),
         description="List of allowed tool patterns"
     )
-    deny: list[str] = Field(
-        default_factory=list,
+    deny: tuple[str, ...] = Field(
+        default=(),
         description="List of denied tool patterns"
     )
-    ask: list[str] = Field(
-        default_factory=list,
+    ask: tuple[str, ...] = Field(
+        default=(),
         description="List of patterns requiring confirmation"
     )
-    allowed_dirs: list[str] = Field(
-        default_factory=list,
+    allowed_dirs: tuple[str, ...] = Field(
+        default=(),
         description="Directories accessible in this profile"
     )
 
     @field_validator("allow", "deny", "ask", "allowed_dirs", mode="before")
     @classmethod
-    def convert_none_to_list(cls, v: Any) -> list[str]:
-        """Convert None (from empty YAML values) to empty list."""
+    def convert_none_to_empty(cls, v: Any) -> Any:
+        """Convert None (from empty YAML values) to an empty tuple."""
         if v is None:
-            return []
+            return ()
         return v
 
 
@@ -116,31 +194,62 @@ class SessionWorkspaceConfig(BaseModel):
     Defines patterns for dynamically generating session-specific
     permission rules. Use {workspace} placeholder for the workspace path.
     """
+    model_config = ConfigDict(frozen=True)
+
     description: str = Field(
         default="",
         description="Description of the session workspace configuration"
     )
-    allow: list[str] = Field(
-        default_factory=list,
+    allow: tuple[str, ...] = Field(
+        default=(),
         description="Allow patterns. Supports {workspace} placeholder."
     )
-    deny: list[str] = Field(
-        default_factory=list,
+    deny: tuple[str, ...] = Field(
+        default=(),
         description="Deny patterns."
     )
-    allowed_dirs: list[str] = Field(
-        default_factory=list,
+    allowed_dirs: tuple[str, ...] = Field(
+        default=(),
         description="Allowed directories. Supports {workspace} placeholder."
     )
 
+    # Per field, the patterns split on {workspace}; None if it has none
+    _templates: dict[str, Optional[tuple[tuple[str, ...], ...]]] = PrivateAttr(
+        default_factory=dict
+    )
+
     @field_validator("allow", "deny", "allowed_dirs", mode="before")
     @classmethod
-    def convert_none_to_list(cls, v: Any) -> list[str]:
-        """Convert None (from empty YAML values) to empty list."""
+    def convert_none_to_empty(cls, v: Any) -> Any:
+        """Convert None (from empty YAML values) to an empty tuple."""
         if v is None:
-            return []
+            return ()
         return v
 
+    def model_post_init(self, __context: Any) -> None:
+        """Split the pattern fields on {workspace} once."""
+        self._templates = {
+            name: _split_workspace_templates(getattr(self, name))
+            for name in ("allow", "deny", "allowed_dirs")
+        }
+
+    def substitute(self, name: str, workspace: str) -> tuple[str, ...]:
+        """
+        Get a pattern field with {workspace} replaced by a workspace path.
+
+        Args:
+            name: "allow", "deny" or "allowed_dirs".
+            workspace: Workspace path to insert.
+
+        Returns:
+            The substituted patterns. A field without placeholders is
+            returned as-is.
+        """
+        templates = self._templates[name]
+        if templates is None:
+            return getattr(self, name)
+        return tuple(workspace.join(parts) for parts in templates)
+
 
 class CheckpointingConfig(BaseModel):
     """
@@ -149,17 +258,19 @@ class CheckpointingConfig(BaseModel):
     Defines which tools trigger automatic checkpoint creation
     for file change tracking and rewind functionality.
     """
-    auto_checkpoint_tools: list[str] = Field(
-        default_factory=lambda: ["Write", "Edit"],
+    model_config = ConfigDict(frozen=True)
+
+    auto_checkpoint_tools: tuple[str, ...] = Field(
+        default=("Write", "Edit"),
         description="Tools that trigger automatic checkpoint creation after execution"
     )
 
     @field_validator("auto_checkpoint_tools", mode="before")
     @classmethod
-    def convert_none_to_list(cls, v: Any) -> list[str]:
-        """Convert None (from empty YAML values) to empty list."""
+    def convert_none_to_default(cls, v: Any) -> Any:
+        """Convert None (from empty YAML values) to the default tools."""
         if v is None:
-            return ["Write", "Edit"]
+            return ("Write", "Edit")
         return v
 
 
@@ -169,6 +280,8 @@ class PermissionProfile(BaseModel):
 
     Uses 'session_workspace' for dynamic session-specific rules.
     """
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(
         description="Profile name (e.g., 'user')"
     )
@@ -207,6 +320,131 @@ class ProfileNotFoundError(Exception):
     pass
 
 
+@dataclass(slots=True, frozen=True)
+class _ProfileSnapshot:
+    """Summary of the active profile for activation logs and the tracer."""
+
+    name: str
+    tools: tuple[str, ...]
+    allow_count: int
+    deny_count: int
+    path: str
+
+
+def _prefetch_file(path: Path) -> None:
+    """
+    Ask the kernel to start reading a file into the page cache.
+
+    The profile is parsed lazily on first use; hinting at construction
+    lets the read overlap with the rest of startup. A no-op where
+    posix_fadvise is unavailable or the file cannot be opened.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Parsed profiles keyed by file path, tagged with the (mtime_ns, size) they
+# were parsed from. Profiles are frozen, so managers can share one instance.
+_PARSED_PROFILES: dict[Path, tuple[tuple[int, int], PermissionProfile]] = {}
+
+
+@functools.cache
+def _profile_schema_digest() -> bytes:
+    """Hash the profile schema, so caches written for other models are ignored."""
+    schema = json.dumps(PermissionProfile.model_json_schema(), sort_keys=True)
+    return hashlib.blake2b(schema.encode(), digest_size=16).digest()
+
+
+def _profile_source_digest(raw: bytes) -> str:
+    """Hash a profile file's bytes together with the current profile schema."""
+    digest = hashlib.blake2b(_profile_schema_digest(), digest_size=16)
+    digest.update(raw)
+    return digest.hexdigest()
+
+
+class _ProfileCacheEntry(BaseModel):
+    """Contents of a profile cache file."""
+
+    source: str = Field(description="Source digest the profile was parsed from")
+    profile: PermissionProfile
+
+
+def _profile_cache_path(path: Path, source_digest: str) -> Optional[Path]:
+    """
+    Get the JSON cache file of a YAML profile, or None if caching is off.
+
+    The cache is opt-in: it is used only when AGENTUM_PROFILE_CACHE_DIR
+    names a directory. A cached profile replaces parsing the YAML, so that
+    directory must only be writable by the agent's own user.
+
+    The name is derived from the source digest, so editing the profile or
+    upgrading the profile models switches to a new cache file.
+    """
+    cache_dir = os.environ.get("AGENTUM_PROFILE_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return Path(cache_dir) / f".{path.name}.{source_digest[:16]}.cache.json"
+
+
+def _read_profile_cache(
+    cache_path: Path,
+    source_digest: str
+) -> Optional[PermissionProfile]:
+    """
+    Load a cached profile, or return None if it is missing or unusable.
+
+    The cache is only used if it records the same source digest, i.e. it
+    was written from the same file bytes under the same profile schema.
+    """
+    try:
+        entry = _ProfileCacheEntry.model_validate_json(cache_path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug("Ignoring profile cache %s: %s", cache_path, e)
+        return None
+    if entry.source != source_digest:
+        logger.debug("Ignoring profile cache %s: source mismatch", cache_path)
+        return None
+    return entry.profile
+
+
+def _write_profile_cache(
+    path: Path,
+    cache_path: Path,
+    source_digest: str,
+    profile: PermissionProfile
+) -> None:
+    """
+    Store a parsed profile as JSON and remove caches of older versions.
+
+    Failures are logged and ignored; the cache is only an optimization
+    and the cache directory may be read-only.
+    """
+    entry = _ProfileCacheEntry(source=source_digest, profile=profile)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        tmp_path.write_text(entry.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+        pattern = f".{glob.escape(path.name)}.*.cache.json"
+        for stale in cache_path.parent.glob(pattern):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug("Could not write profile cache %s: %s", cache_path, e)
+
+
 class PermissionManager:
     """
     Manages permission profile for agent operations.
@@ -229,6 +467,27 @@ class PermissionManager:
     PROFILE_BASE = "permissions"
     SUPPORTED_EXTENSIONS = [".yaml", ".yml", ".json"]
 
+    __slots__ = (
+        "_profile_path",
+        "_profile",
+        "_profile_base",
+        "_active_profile",
+        "_session_id",
+        "_workspace_path",
+        "_workspace_absolute_path",
+        "_session_dir",
+        "_workspace_dir",
+        "_session_key",
+        "_session_base",
+        "_sandbox_cache",
+        "_config_manager",
+        "_allow_by_tool",
+        "_deny_by_tool",
+        "_configured_profile",
+        "_active_snapshot",
+        "_tracer",
+    )
+
     def __init__(
         self,
         profile_path: Optional[Path] = None
@@ -244,6 +503,7 @@ class PermissionManager:
         self._profile_path = (
             profile_path or self._find_profile_file(self.PROFILE_BASE)
         )
+        _prefetch_file(self._profile_path)
 
         self._profile: Optional[PermissionProfile] = None
         self._profile_base: Optional[PermissionProfile] = None  # Template
@@ -253,10 +513,28 @@ class PermissionManager:
         self._session_id: Optional[str] = None
         self._workspace_path: Optional[str] = None
         self._workspace_absolute_path: Optional[Path] = None
+        # String forms of the session and workspace directories ("" if unset)
+        self._session_dir = ""
+        self._workspace_dir = ""
+        # (session_id, workspace_path) and base profile of the last session
+        # profile built
+        self._session_key: Optional[tuple[Optional[str], str]] = None
+        self._session_base: Optional[PermissionProfile] = None
+        # Resolved sandbox configs keyed by (session_dir, workspace_dir)
+        self._sandbox_cache: dict[tuple[str, str], SandboxConfig] = {}
 
         # Internal config manager for permission checking
         self._config_manager = PermissionConfigManager()
 
+        # Allow/deny patterns of the active profile grouped by tool name,
+        # rebuilt whenever the active profile changes
+        self._allow_by_tool: dict[str, list[str]] = {}
+        self._deny_by_tool: dict[str, list[str]] = {}
+        # Profile the config manager was last configured from, and its
+        # summary for activation logs and the tracer
+        self._configured_profile: Optional[PermissionProfile] = None
+        self._active_snapshot: Optional[_ProfileSnapshot] = None
+
         # Optional tracer for notifications
         self._tracer: Optional["TracerBase"] = None
 
@@ -273,7 +551,8 @@ class PermissionManager:
         """
         Find a profile file by base name, trying extensions in order.
 
-        Tries .yaml first, then .yml, then .json.
+        Tries .yaml first, then .yml, then .json. The config directory is
+        listed once instead of stat()ing each candidate.
 
         Args:
             base_name: Base filename without extension (e.g., "permissions").
@@ -282,46 +561,57 @@ class PermissionManager:
             Path to the first existing file, or path with .yaml extension
             if no file exists (for error reporting).
         """
+        try:
+            with os.scandir(CONFIG_DIR) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}
         for ext in self.SUPPORTED_EXTENSIONS:
-            path = CONFIG_DIR / f"{base_name}{ext}"
-            if path.exists():
-                return path
+            entry = entries.get(f"{base_name}{ext}")
+            if entry is not None and entry.is_file():
+                return CONFIG_DIR / entry.name
         # Return default .yaml path if nothing exists
         return CONFIG_DIR / f"{base_name}.yaml"
 
-    def _notify_profile_loaded(self) -> None:
+    def _snapshot(self, profile: PermissionProfile) -> _ProfileSnapshot:
+        """Summarize a profile."""
+        permissions = profile.permissions
+        return _ProfileSnapshot(
+            name=profile.name,
+            tools=profile.tools.enabled_tools,
+            allow_count=len(permissions.allow) if permissions else 0,
+            deny_count=len(permissions.deny) if permissions else 0,
+            path=str(self._profile_path),
+        )
+
+    def _notify_profile_loaded(self, snapshot: _ProfileSnapshot) -> None:
         """Notify tracer about profile load if tracer is set."""
-        if self._tracer is None or self._active_profile is None:
+        if self._tracer is None:
             return
 
-        tools = self.get_enabled_tools()
-        allow_count = 0
-        deny_count = 0
-        if self._active_profile.permissions is not None:
-            allow_count = len(self._active_profile.permissions.allow)
-            deny_count = len(self._active_profile.permissions.deny)
-
-        profile_path = str(self._profile_path)
-
         # Call on_profile_switch with 'user' type for compatibility
         self._tracer.on_profile_switch(
             profile_type="user",
-            profile_name=self._active_profile.name,
-            tools=tools,
-            allow_rules_count=allow_count,
-            deny_rules_count=deny_count,
-            profile_path=profile_path
+            profile_name=snapshot.name,
+            tools=list(snapshot.tools),
+            allow_rules_count=snapshot.allow_count,
+            deny_rules_count=snapshot.deny_count,
+            profile_path=snapshot.path
         )
 
-    def _load_profile(self, path: Path) -> PermissionProfile:
+    def _load_profile(self, path: Path, force: bool = False) -> PermissionProfile:
         """
         Load a permission profile from file (YAML or JSON).
 
         Supports both YAML (.yaml, .yml) and JSON (.json) formats.
-        Format is determined by file extension.
+        Format is determined by file extension. Parsed profiles are shared
+        by all managers of the process, and parsed YAML profiles are cached
+        as JSON if AGENTUM_PROFILE_CACHE_DIR is set; both are reused until
+        the file changes.
 
         Args:
             path: Path to profile file.
+            force: Parse the file even if its mtime and size are unchanged.
 
         Returns:
             Loaded PermissionProfile.
@@ -330,37 +620,96 @@ class PermissionManager:
             ProfileNotFoundError: If profile file does not exist.
             ValueError: If profile file is invalid.
         """
-        if not path.exists():
+        try:
+            stat = path.stat()
+        except OSError:
             raise ProfileNotFoundError(
                 f"Permission profile not found: {path}\n"
                 f"Create the profile file manually or copy from templates.\n"
                 f"Supported formats: .yaml, .yml, .json"
             )
 
+        # Set AGENTUM_PROFILE_CACHE=0 to always parse profile files from scratch
+        if os.environ.get("AGENTUM_PROFILE_CACHE", "1") == "0":
+            return self._parse_profile(path, use_cache=False)
+
+        file_state = (stat.st_mtime_ns, stat.st_size)
+        cached = _PARSED_PROFILES.get(path)
+        if not force and cached is not None and cached[0] == file_state:
+            return cached[1]
+        profile = self._parse_profile(path)
+        _PARSED_PROFILES[path] = (file_state, profile)
+        return profile
+
+    def _parse_profile(self, path: Path, use_cache: bool = True) -> PermissionProfile:
+        """
+        Parse and validate a profile file, using its JSON cache if enabled.
+
+        Args:
+            path: Path to profile file.
+            use_cache: Read and write the JSON cache of YAML profiles.
+
+        Returns:
+            Parsed PermissionProfile.
+
+        Raises:
+            ValueError: If profile file is invalid.
+        """
         try:
-            with path.open("r", encoding="utf-8") as f:
-                # Determine format by extension
-                suffix = path.suffix.lower()
-                if suffix in (".yaml", ".yml"):
-                    data = yaml.safe_load(f)
-                elif suffix == ".json":
-                    data = json.load(f)
-                else:
-                    # Try YAML first (more permissive parser)
-                    data = yaml.safe_load(f)
-
-            profile = PermissionProfile.model_validate(data)
-            logger.info(f"Loaded permission profile from {path}")
-            return profile
-        except yaml.YAMLError as e:
-            raise ValueError(f"Failed to parse YAML profile {path}: {e}")
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse JSON profile {path}: {e}")
-        except Exception as e:
+            raw = path.read_bytes()
+        except OSError as e:
             raise ValueError(f"Failed to load profile {path}: {e}")
 
+        # Determine format by extension
+        suffix = path.suffix.lower()
+        cache_path: Optional[Path] = None
+        source_digest = ""
+        if suffix != ".json" and use_cache:
+            source_digest = _profile_source_digest(raw)
+            cache_path = _profile_cache_path(path, source_digest)
+            if cache_path is not None:
+                profile = _read_profile_cache(cache_path, source_digest)
+                if profile is not None:
+                    logger.info(f"Loaded permission profile from {path} (cached)")
+                    return profile
+
+        if suffix == ".json":
+            # pydantic parses and validates the raw bytes in a single pass,
+            # without building an intermediate dict
+            try:
+                profile = PermissionProfile.model_validate_json(raw)
+            except ValidationError as e:
+                if any(error["type"] == "json_invalid" for error in e.errors()):
+                    raise ValueError(f"Failed to parse JSON profile {path}: {e}")
+                raise ValueError(f"Failed to load profile {path}: {e}")
+            except Exception as e:
+                raise ValueError(f"Failed to load profile {path}: {e}")
+        else:
+            # Imported only on this branch so JSON profiles never load PyYAML
+            import yaml
+
+            # YAML for .yaml/.yml, and first try for unknown extensions
+            # (more permissive parser). The whole file is handed over as
+            # bytes to the libyaml-backed loader when PyYAML was built with it.
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            try:
+                data = yaml.load(raw, Loader=loader)
+                profile = PermissionProfile.model_validate(data)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Failed to parse YAML profile {path}: {e}")
+            except Exception as e:
+                raise ValueError(f"Failed to load profile {path}: {e}")
+
+        if cache_path is not None:
+            _write_profile_cache(path, cache_path, source_digest, profile)
+        logger.info(f"Loaded permission profile from {path}")
+        return profile
+
     def _ensure_profile_loaded(self) -> None:
         """Ensure profile is loaded from config file."""
+        if self._profile is not None:
+            # Loaded; _profile is only set once a base profile exists
+            return
         if self._profile_base is None:
             self._profile_base = self._load_profile(self._profile_path)
         if self._profile is None:
@@ -370,9 +719,18 @@ class PermissionManager:
             self._update_config_manager()
 
     def reload_profile(self) -> None:
-        """Force reload profile from file."""
-        self._profile = None
-        self._profile_base = None
+        """
+        Reload the profile by re-parsing its file.
+
+        The file is parsed even if its mtime and size are unchanged. If the
+        re-parsed profile equals the loaded one, the current base and
+        session profiles are kept.
+        """
+        base = self._load_profile(self._profile_path, force=True)
+        if base != self._profile_base:
+            self._profile = None
+            self._profile_base = base
+            self._sandbox_cache.clear()
         self._ensure_profile_loaded()
         # Re-apply session context if set
         if self._session_id and self._workspace_path:
@@ -408,6 +766,10 @@ class PermissionManager:
         self._session_id = session_id
         self._workspace_path = workspace_path
         self._workspace_absolute_path = workspace_absolute_path
+        self._session_dir = str(SESSIONS_DIR / session_id) if session_id else ""
+        self._workspace_dir = (
+            str(workspace_absolute_path) if workspace_absolute_path is not None else ""
+        )
         self._ensure_profile_loaded()
         self._build_session_profile()
 
@@ -436,12 +798,20 @@ class PermissionManager:
         session-specific permission rules from the session_workspace config.
         Uses patterns defined in permissions.yaml, replacing {workspace}
         placeholder with the actual workspace path.
+
+        Does nothing if the profile was already built for the same session,
+        workspace and base profile.
         """
         if self._profile_base is None or self._workspace_path is None:
             return
 
         base = self._profile_base
         workspace = self._workspace_path
+        session_key = (self._session_id, workspace)
+        if base is self._session_base and session_key == self._session_key:
+            return
+        self._session_key = session_key
+        self._session_base = base
 
         # Check if session_workspace config exists
         if base.session_workspace is None:
@@ -456,35 +826,28 @@ class PermissionManager:
 
         ws_config = base.session_workspace
 
-        # Build session-specific allow rules from config
+        # Build session-specific allow/deny rules and allowed_dirs from config
         # Replace {workspace} placeholder with actual workspace path
-        session_allow: list[str] = []
-        for pattern in ws_config.allow:
-            session_allow.append(pattern.replace("{workspace}", workspace))
-
-        # Build session-specific deny rules from config
-        session_deny: list[str] = []
-        for pattern in ws_config.deny:
-            session_deny.append(pattern.replace("{workspace}", workspace))
-
-        # Build session-specific allowed_dirs from config
-        session_allowed_dirs: list[str] = []
-        for pattern in ws_config.allowed_dirs:
-            session_allowed_dirs.append(pattern.replace("{workspace}", workspace))
-
-        # Create session-specific profile with permissions for the config manager
-        self._profile = PermissionProfile(
+        session_allow = ws_config.substitute("allow", workspace)
+        session_deny = ws_config.substitute("deny", workspace)
+        session_allowed_dirs = ws_config.substitute("allowed_dirs", workspace)
+
+        # Create session-specific profile with permissions for the config
+        # manager. All parts come from the validated base profile, so the
+        # models are constructed without re-running validation; the frozen
+        # tools config is shared with the base profile.
+        self._profile = PermissionProfile.model_construct(
             name=f"user:{self._session_id}",
             description=(
                 f"Session-specific profile. "
                 f"Sandboxed to workspace: {workspace}"
             ),
             defaultMode=base.defaultMode,
-            tools=base.tools.model_copy(),
-            permissions=ExtendedPermissionRules(
+            tools=base.tools,
+            permissions=ExtendedPermissionRules.model_construct(
                 allow=session_allow,
                 deny=session_deny,
-                ask=[],
+                ask=(),
                 allowed_dirs=session_allowed_dirs,
             ),
         )
@@ -504,6 +867,10 @@ class PermissionManager:
         self._session_id = None
         self._workspace_path = None
         self._workspace_absolute_path = None
+        self._session_dir = ""
+        self._workspace_dir = ""
+        self._session_key = None
+        self._session_base = None
         if self._profile_base is not None:
             self._profile = self._profile_base
             self._active_profile = self._profile
@@ -515,13 +882,14 @@ class PermissionManager:
     @property
     def profile(self) -> PermissionProfile:
         """Get the current profile."""
-        self._ensure_profile_loaded()
+        if self._profile is None:
+            self._ensure_profile_loaded()
         return self._profile  # type: ignore
 
     @property
     def active_profile(self) -> PermissionProfile:
         """Get the currently active profile."""
-        if self._active_profile is None:
+        if self._profile is None:
             self._ensure_profile_loaded()
         return self._active_profile  # type: ignore
 
@@ -534,29 +902,28 @@ class PermissionManager:
         return self.get_sandbox_config()
 
     def get_sandbox_config(self) -> Optional[SandboxConfig]:
-        """Resolve sandbox config placeholders using current session context."""
-        self._ensure_profile_loaded()
+        """
+        Resolve sandbox config placeholders using current session context.
+
+        The resolved config is cached per session and workspace directory
+        until the profile is reloaded; callers must not modify it.
+        """
+        if self._profile is None:
+            self._ensure_profile_loaded()
         if self._profile_base is None or self._profile_base.sandbox is None:
             return None
 
-        session_dir = ""
-        workspace_dir = ""
-        if self._session_id:
-            session_dir = str(SESSIONS_DIR / self._session_id)
-        if self._workspace_absolute_path is not None:
-            workspace_dir = str(self._workspace_absolute_path)
-
-        placeholders = {
-            "agent_dir": str(AGENT_DIR),
-            "sessions_dir": str(SESSIONS_DIR),
-            "session_dir": session_dir,
-            "workspace_dir": workspace_dir,
-            "config_dir": str(CONFIG_DIR),
-            "skills_dir": str(SKILLS_DIR),
-            "logs_dir": str(LOGS_DIR),
-            "data_dir": str(DATA_DIR),
-        }
-        return self._profile_base.sandbox.resolve(placeholders)
+        key = (self._session_dir, self._workspace_dir)
+        resolved = self._sandbox_cache.get(key)
+        if resolved is None:
+            placeholders = {
+                **_STATIC_SANDBOX_PLACEHOLDERS,
+                "session_dir": self._session_dir,
+                "workspace_dir": self._workspace_dir,
+            }
+            resolved = self._profile_base.sandbox.resolve(placeholders)
+            self._sandbox_cache[key] = resolved
+        return resolved
 
     def activate(self) -> PermissionProfile:
         """
@@ -568,26 +935,38 @@ class PermissionManager:
         self._ensure_profile_loaded()
 
         # Log profile activation with details
-        profile_name = self._active_profile.name if self._active_profile else "user"
-        allow_count = 0
-        deny_count = 0
-        if self._active_profile and self._active_profile.permissions:
-            allow_count = len(self._active_profile.permissions.allow)
-            deny_count = len(self._active_profile.permissions.deny)
+        snapshot: _ProfileSnapshot = self._active_snapshot  # type: ignore
         logger.info(
-            f"PROFILE: Activated '{profile_name}' "
-            f"(allow={allow_count}, deny={deny_count})"
+            f"PROFILE: Activated '{snapshot.name}' "
+            f"(allow={snapshot.allow_count}, deny={snapshot.deny_count})"
         )
 
         # Notify tracer about profile load
-        self._notify_profile_loaded()
+        self._notify_profile_loaded(snapshot)
 
         return self._active_profile  # type: ignore
 
     def _update_config_manager(self) -> None:
-        """Update the internal config manager with active profile settings."""
-        if self._active_profile is None:
+        """
+        Update the internal config manager with active profile settings.
+
+        Does nothing if the config manager already uses the active profile.
+        """
+        if (
+            self._active_profile is None
+            or self._active_profile is self._configured_profile
+        ):
             return
+        self._configured_profile = self._active_profile
+        self._active_snapshot = self._snapshot(self._active_profile)
+
+        permissions = self._active_profile.permissions
+        if permissions is None:
+            self._allow_by_tool = {}
+            self._deny_by_tool = {}
+        else:
+            self._allow_by_tool = index_patterns_by_tool(permissions.allow)
+            self._deny_by_tool = index_patterns_by_tool(permissions.deny)
 
         # Convert profile to PermissionConfig for the config manager
         # Map ExtendedPermissionRules to PermissionRules
@@ -610,11 +989,8 @@ class PermissionManager:
             permissions=perm_rules,
             tools=tools_config,
         )
-        self._config_manager._config = config
-        # Set _last_modified to prevent reload from file
-        self._config_manager._last_modified = time.time()
-        # Also clear _config_path to prevent file-based reload
-        self._config_manager._config_path = None
+        # Pin the profile config so it is never replaced by a file reload
+        self._config_manager.use_config(config)
 
     def is_allowed(self, tool_call: str) -> bool:
         """
@@ -626,7 +1002,7 @@ class PermissionManager:
         Returns:
             True if allowed, False if denied.
         """
-        if self._active_profile is None:
+        if self._profile is None:
             self._ensure_profile_loaded()
         return self._config_manager.is_tool_allowed(tool_call)
 
@@ -640,16 +1016,15 @@ class PermissionManager:
         Returns:
             True if confirmation needed.
         """
+        if self._profile is None:
+            self._ensure_profile_loaded()
         return self._config_manager.needs_confirmation(tool_call)
 
     def get_enabled_tools(self) -> list[str]:
         """Get list of enabled tools for current profile."""
-        profile = self.active_profile
-        enabled = set(profile.tools.enabled)
-        disabled = set(profile.tools.disabled)
-        return list(enabled - disabled)
+        return list(self.active_profile.tools.enabled_tools)
 
-    def get_permission_checked_tools(self) -> set[str]:
+    def get_permission_checked_tools(self) -> frozenset[str]:
         """
         Get tools that require permission callback checks.
 
@@ -658,9 +1033,9 @@ class PermissionManager:
         Returns:
             Set of tool names that need permission checks.
         """
-        return set(self.active_profile.tools.permission_checked)
+        return self.active_profile.tools.permission_checked_tools
 
-    def get_disabled_tools(self) -> set[str]:
+    def get_disabled_tools(self) -> frozenset[str]:
         """
         Get tools that are completely disabled.
 
@@ -669,7 +1044,7 @@ class PermissionManager:
         Returns:
             Set of tool names that are disabled.
         """
-        return set(self.active_profile.tools.disabled)
+        return self.active_profile.tools.disabled_tools
 
     def get_pre_approved_tools(self) -> list[str]:
         """
@@ -678,10 +1053,7 @@ class PermissionManager:
         Returns:
             List of tool names that don't require permission checks.
         """
-        enabled = set(self.get_enabled_tools())
-        permission_checked = self.get_permission_checked_tools()
-        disabled = self.get_disabled_tools()
-        return list(enabled - permission_checked - disabled)
+        return list(self.active_profile.tools.pre_approved_tools)
 
     def get_allowed_dirs(self) -> list[str]:
         """
@@ -707,10 +1079,9 @@ class PermissionManager:
         Returns:
             List of allowed patterns for the tool.
         """
-        profile = self.active_profile
-        if profile.permissions is None:
-            return []
-        return extract_patterns_for_tool(tool_name, profile.permissions.allow)
+        if self._profile is None:
+            self._ensure_profile_loaded()
+        return list(self._allow_by_tool.get(tool_name, ()))
 
     def get_denied_patterns_for_tool(self, tool_name: str) -> list[str]:
         """
@@ -722,10 +1093,9 @@ class PermissionManager:
         Returns:
             List of denied patterns for the tool.
         """
-        profile = self.active_profile
-        if profile.permissions is None:
-            return []
-        return extract_patterns_for_tool(tool_name, profile.permissions.deny)
+        if self._profile is None:
+            self._ensure_profile_loaded()
+        return list(self._deny_by_tool.get(tool_name, ()))
 
     def save_profile(
         self,
@@ -752,11 +1122,17 @@ class PermissionManager:
         data = profile.model_dump(mode="json")
         suffix = target_path.suffix.lower()
 
-        with target_path.open("w", encoding="utf-8") as f:
-            if suffix in (".yaml", ".yml"):
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-            else:
-                json.dump(data, f, indent=2)
+        if suffix in (".yaml", ".yml"):
+            import yaml
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+            with target_path.open("w", encoding="utf-8") as f:
+                yaml.dump(
+                    data, f, Dumper=dumper,
+                    default_flow_style=False, sort_keys=False,
+                )
+        else:
+            # Serialize in memory and write once instead of streaming chunks
+            target_path.write_bytes(json.dumps(data, indent=2).encode("utf-8"))
 
         logger.info(f"Saved profile '{profile.name}' to {target_path}")
         return target_path
@@ -783,6 +1159,8 @@ def validate_profile_file(config_dir: Optional[Path] = None) -> Path:
     """
     Validate that permission profile file exists.
 
+    Only the .yaml profile is accepted; the file is not parsed.
+
     Args:
         config_dir: Directory containing profile.
                    Defaults to AGENT/config/.
@@ -796,7 +1174,10 @@ def validate_profile_file(config_dir: Optional[Path] = None) -> Path:
     if config_dir is None:
         config_dir = CONFIG_DIR
 
-    manager = PermissionManager(
-        profile_path=config_dir / f"{PermissionManager.PROFILE_BASE}.yaml"
-    )
-    return manager.validate_profile_exists()
+    path = config_dir / f"{PermissionManager.PROFILE_BASE}.yaml"
+    if not path.exists():
+        raise ProfileNotFoundError(
+            f"Permission profile not found: {path}\n"
+            "Create the file manually or copy from templates."
+        )
+    return path
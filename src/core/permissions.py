@@ -6,12 +6,15 @@ the new centralized PermissionConfig system with legacy code.
 
 For full permission configuration, see permission_config.py.
 """
+import functools
 import json
 import logging
+import os
 import re
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Mapping, Optional
 
 from claude_agent_sdk import (
     PermissionResultAllow,
@@ -26,17 +29,15 @@ from .dangerous_patterns_loader import load_dangerous_patterns
 # Patterns are loaded once at module import time for performance
 DANGEROUS_COMMAND_PATTERNS: list[str] = load_dangerous_patterns()
 
+from . import permission_config
 from .permission_config import (
-    AVAILABLE_TOOLS,
-    DEFAULT_PERMISSION_CONFIG,
-    DANGEROUS_TOOLS,
-    SAFE_TOOLS,
     PermissionConfig,
     PermissionConfigManager,
     PermissionMode,
     PermissionRules,
     ToolDefinition,
     ToolsConfig,
+    default_permission_config,
     get_all_tool_definitions,
     get_dangerous_tools,
     get_safe_tools,
@@ -44,8 +45,18 @@ from .permission_config import (
 
 logger = logging.getLogger(__name__)
 
+# Most recent denials kept by a PermissionDenialTracker
+MAX_TRACKED_DENIALS = 1000
 
-@dataclass
+
+def __getattr__(name: str) -> Any:
+    """Forward AVAILABLE_TOOLS, SAFE_TOOLS and DANGEROUS_TOOLS lazily."""
+    if name in ("AVAILABLE_TOOLS", "SAFE_TOOLS", "DANGEROUS_TOOLS"):
+        return getattr(permission_config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass(slots=True)
 class PermissionDenial:
     """
     Record of a permission denial.
@@ -60,8 +71,13 @@ class PermissionDenial:
 class PermissionDenialTracker:
     """
     Tracks permission denials during agent execution.
+
+    Only the most recent MAX_TRACKED_DENIALS denials are kept, so an agent
+    stuck in a denial loop cannot grow the record without bound.
     """
-    denials: list[PermissionDenial] = field(default_factory=list)
+    denials: deque[PermissionDenial] = field(
+        default_factory=lambda: deque(maxlen=MAX_TRACKED_DENIALS)
+    )
     _interrupted: bool = False
 
     def record_denial(
@@ -136,9 +152,11 @@ class PermissionManager:
         tools = manager.get_allowed_tools_for_sdk()
     """
 
-    DEFAULT_PERMISSIONS: dict[str, Any] = DEFAULT_PERMISSION_CONFIG.model_dump(
-        mode="json"
-    )
+    @classmethod
+    @functools.cache
+    def default_permissions(cls) -> dict[str, Any]:
+        """Get the default permissions as a dictionary, built on first use."""
+        return default_permission_config().model_dump(mode="json")
 
     def __init__(
         self,
@@ -179,18 +197,18 @@ class PermissionManager:
         return self._load_config()
 
     @property
-    def allow_rules(self) -> list[str]:
-        """Get the list of allowed patterns."""
+    def allow_rules(self) -> tuple[str, ...]:
+        """Get the allowed patterns."""
         return self._load_config().permissions.allow
 
     @property
-    def deny_rules(self) -> list[str]:
-        """Get the list of denied patterns."""
+    def deny_rules(self) -> tuple[str, ...]:
+        """Get the denied patterns."""
         return self._load_config().permissions.deny
 
     @property
-    def ask_rules(self) -> list[str]:
-        """Get the list of patterns requiring confirmation."""
+    def ask_rules(self) -> tuple[str, ...]:
+        """Get the patterns requiring confirmation."""
         return self._load_config().permissions.ask
 
     @property
@@ -274,9 +292,13 @@ class PermissionManager:
         settings_file = claude_dir / "settings.local.json"
         settings_data = self.to_claude_settings()
 
-        settings_file.write_text(
-            json.dumps(settings_data, indent=2)
+        # Serialize in memory and swap the file in atomically, so a reader
+        # never sees a partially written settings file
+        tmp_file = settings_file.with_name(settings_file.name + ".tmp")
+        tmp_file.write_bytes(
+            json.dumps(settings_data, indent=2).encode("utf-8")
         )
+        os.replace(tmp_file, settings_file)
         logger.info(f"Saved permissions to {settings_file}")
 
     def save_config(self, target_path: Optional[Path] = None) -> Path:
@@ -292,18 +314,18 @@ class PermissionManager:
         return self._config_manager.save(target_path)
 
     @staticmethod
-    def get_available_tools() -> dict[str, ToolDefinition]:
+    def get_available_tools() -> Mapping[str, ToolDefinition]:
         """Get all available tool definitions."""
         return get_all_tool_definitions()
 
     @staticmethod
-    def get_safe_tools() -> list[str]:
-        """Get list of safe (read-only) tools."""
+    def get_safe_tools() -> tuple[str, ...]:
+        """Get the safe (read-only) tools."""
         return get_safe_tools()
 
     @staticmethod
-    def get_dangerous_tools() -> list[str]:
-        """Get list of dangerous tools."""
+    def get_dangerous_tools() -> tuple[str, ...]:
+        """Get the dangerous tools."""
         return get_dangerous_tools()
 
 
@@ -372,8 +394,18 @@ def create_permission_callback(
     Returns:
         Async permission callback for ClaudeAgentOptions.can_use_tool.
     """
-    # Track denial counts per tool to enable smart interrupt
+    # Track denial counts per tool (and their running total) to enable
+    # smart interrupt
     denial_counts: dict[str, int] = {}
+    total_denials = 0
+    # Denial counts at which to warn and to interrupt
+    penultimate_at = max_denials_before_interrupt - 1
+    total_interrupt_at = max_denials_before_interrupt * 2
+    # Trace processors without denial tracking are skipped
+    set_permission_denied = (
+        getattr(trace_processor, "set_permission_denied", None)
+        if trace_processor else None
+    )
 
     async def can_use_tool(
         tool_name: str,
@@ -387,14 +419,17 @@ def create_permission_callback(
         - Security violations: immediate interrupt
         - Regular denials: allow learning, interrupt after max_denials_before_interrupt
         """
-        logger.info(f"PERMISSION CHECK: {tool_name} with input: {tool_input}")
+        nonlocal total_denials
+        logger.info("PERMISSION CHECK: %s with input: %s", tool_name, tool_input)
 
         # SECURITY: Always deny attempts to bypass sandbox - immediate interrupt
         if tool_input.get("dangerouslyDisableSandbox"):
             security_msg = "Security violation: sandbox bypass attempted. Agent stopped."
             logger.warning(
-                f"SECURITY: Model attempted to use dangerouslyDisableSandbox! "
-                f"Tool: {tool_name}, Input: {tool_input}"
+                "SECURITY: Model attempted to use dangerouslyDisableSandbox! "
+                "Tool: %s, Input: %s",
+                tool_name,
+                tool_input,
             )
             if on_permission_check:
                 on_permission_check(tool_name, "deny")
@@ -406,8 +441,8 @@ def create_permission_callback(
                     is_security_violation=True,
                     interrupt=True,  # Security violations always interrupt
                 )
-            if trace_processor and hasattr(trace_processor, 'set_permission_denied'):
-                trace_processor.set_permission_denied(True)
+            if set_permission_denied is not None:
+                set_permission_denied(True)
             return PermissionResultDeny(
                 behavior="deny",
                 message=security_msg,
@@ -421,7 +456,7 @@ def create_permission_callback(
             for pattern in DANGEROUS_COMMAND_PATTERNS:
                 if re.search(pattern, command, flags=re.IGNORECASE):
                     security_msg = f"Blocked dangerous command pattern: {pattern}"
-                    logger.warning(f"SECURITY: {security_msg} - command: {command[:100]}...")
+                    logger.warning("SECURITY: %s - command: %.100s...", security_msg, command)
                     if on_permission_check:
                         on_permission_check(tool_name, "deny")
                     if denial_tracker:
@@ -432,8 +467,8 @@ def create_permission_callback(
                             is_security_violation=True,
                             interrupt=True,
                         )
-                    if trace_processor and hasattr(trace_processor, 'set_permission_denied'):
-                        trace_processor.set_permission_denied(True)
+                    if set_permission_denied is not None:
+                        set_permission_denied(True)
                     return PermissionResultDeny(
                         behavior="deny",
                         message=security_msg,
@@ -442,10 +477,10 @@ def create_permission_callback(
 
         # Check permission rules
         tool_call = build_tool_call_string(tool_name, tool_input)
-        logger.info(f"PERMISSION CHECK: tool_call={tool_call}")
+        logger.info("PERMISSION CHECK: tool_call=%s", tool_call)
         allowed = permission_manager.is_allowed(tool_call)
         decision = "allow" if allowed else "deny"
-        logger.info(f"PERMISSION CHECK: decision={decision}")
+        logger.info("PERMISSION CHECK: decision=%s", decision)
 
         if on_permission_check:
             on_permission_check(tool_name, decision)
@@ -466,8 +501,9 @@ def create_permission_callback(
                         missing_mounts = sandbox_executor.validate_mount_sources()
                         if missing_mounts:
                             logger.warning(
-                                f"SANDBOX: Missing mount sources: {missing_mounts}. "
-                                "Command will likely fail."
+                                "SANDBOX: Missing mount sources: %s. "
+                                "Command will likely fail.",
+                                missing_mounts,
                             )
 
                         # Wrap the command in bubblewrap for filesystem isolation
@@ -481,8 +517,8 @@ def create_permission_callback(
                         )
                         updated_input = {**tool_input, "command": wrapped_command}
                         logger.info(
-                            f"SANDBOX: Wrapping Bash command in bwrap: "
-                            f"{original_command[:50]}..."
+                            "SANDBOX: Wrapping Bash command in bwrap: %.50s...",
+                            original_command,
                         )
                     except Exception as e:
                         # SECURITY: FAIL-CLOSED - if sandbox fails, DENY the command
@@ -492,7 +528,7 @@ def create_permission_callback(
                             "Bash commands are blocked for security. "
                             "Ensure bubblewrap is installed."
                         )
-                        logger.error(f"SANDBOX FAIL-CLOSED: {security_msg}")
+                        logger.error("SANDBOX FAIL-CLOSED: %s", security_msg)
                         if on_permission_check:
                             on_permission_check(tool_name, "deny")
                         if denial_tracker:
@@ -503,8 +539,8 @@ def create_permission_callback(
                                 is_security_violation=True,
                                 interrupt=True,
                             )
-                        if trace_processor and hasattr(trace_processor, 'set_permission_denied'):
-                            trace_processor.set_permission_denied(True)
+                        if set_permission_denied is not None:
+                            set_permission_denied(True)
                         return PermissionResultDeny(
                             behavior="deny",
                             message=security_msg,
@@ -522,16 +558,16 @@ def create_permission_callback(
             return allow_result
 
         # Denied - track denial count for smart interrupt
-        denial_counts[tool_name] = denial_counts.get(tool_name, 0) + 1
-        current_count = denial_counts[tool_name]
-        total_denials = sum(denial_counts.values())
+        current_count = denial_counts.get(tool_name, 0) + 1
+        denial_counts[tool_name] = current_count
+        total_denials += 1
 
         # Determine if we should interrupt
         should_interrupt = (
             current_count >= max_denials_before_interrupt or
-            total_denials >= max_denials_before_interrupt * 2
+            total_denials >= total_interrupt_at
         )
-        is_penultimate = current_count == max_denials_before_interrupt - 1
+        is_penultimate = current_count == penultimate_at
 
         # Build actionable denial message
         denial_msg = build_actionable_denial_message(
@@ -542,9 +578,11 @@ def create_permission_callback(
         )
 
         logger.info(
-            f"PERMISSION DENIAL: {tool_name} denied "
-            f"(count={current_count}/{max_denials_before_interrupt}, "
-            f"interrupt={should_interrupt})"
+            "PERMISSION DENIAL: %s denied (count=%d/%d, interrupt=%s)",
+            tool_name,
+            current_count,
+            max_denials_before_interrupt,
+            should_interrupt,
         )
 
         # Record denial for output generation
@@ -559,8 +597,8 @@ def create_permission_callback(
 
         # Mark trace processor if we're interrupting
         if should_interrupt:
-            if trace_processor and hasattr(trace_processor, 'set_permission_denied'):
-                trace_processor.set_permission_denied(True)
+            if set_permission_denied is not None:
+                set_permission_denied(True)
 
         deny_result = PermissionResultDeny(
             behavior="deny",
@@ -6,7 +6,7 @@ for building tool call strings and actionable denial messages.
 """
 import sys
 from pathlib import Path
-from typing import Any, Optional, Protocol, runtime_checkable
+from typing import Any, Optional, Protocol, Sequence, runtime_checkable
 
 
 @runtime_checkable
@@ -53,15 +53,13 @@ def build_tool_call_string(tool_name: str, tool_input: dict[str, Any]) -> str:
         >>> build_tool_call_string("Bash", {"command": "ls -la"})
         'Bash(ls -la)'
     """
-    if tool_name in TOOL_PARAM_MAP:
-        param_keys = TOOL_PARAM_MAP[tool_name]
-        value = ""
-        for key in param_keys:
-            if key in tool_input:
-                value = tool_input[key]
-                break
-        return f"{tool_name}({value})"
-    return tool_name
+    param_keys = TOOL_PARAM_MAP.get(tool_name)
+    if param_keys is None:
+        return tool_name
+    for key in param_keys:
+        if key in tool_input:
+            return f"{tool_name}({tool_input[key]})"
+    return f"{tool_name}()"
 
 
 def build_actionable_denial_message(
@@ -145,20 +143,52 @@ def extract_patterns_for_tool(
         ['*']
     """
     patterns = []
-    prefix = f"{tool_name}("
 
     for pattern in permission_list:
-        if pattern.startswith(prefix):
+        name, paren, rest = pattern.partition("(")
+        if name != tool_name:
+            continue
+        if paren:
             # Extract the pattern inside parentheses
-            inner = pattern[len(prefix):-1] if pattern.endswith(")") else pattern[len(prefix):]
-            patterns.append(inner)
-        elif pattern == tool_name:
+            patterns.append(rest[:-1] if rest.endswith(")") else rest)
+        else:
             # Tool name without parentheses means all uses are allowed
             patterns.append("*")
 
     return patterns
 
 
+def index_patterns_by_tool(permission_list: Sequence[str]) -> dict[str, list[str]]:
+    """
+    Group the patterns of a permission list by tool name.
+
+    Produces the same per-tool patterns as extract_patterns_for_tool, for
+    all tools in one pass over the list.
+
+    Args:
+        permission_list: List of permission patterns (allow or deny list).
+
+    Returns:
+        Mapping of tool name to its extracted patterns, in list order.
+        Tool names are interned so lookups by interned names compare by
+        identity.
+
+    Examples:
+        >>> index_patterns_by_tool(["Read(./input/**)", "Write", "Read(*)"])
+        {'Read': ['./input/**', '*'], 'Write': ['*']}
+    """
+    index: dict[str, list[str]] = {}
+    for pattern in permission_list:
+        name, paren, rest = pattern.partition("(")
+        if paren:
+            inner = rest[:-1] if rest.endswith(")") else rest
+        else:
+            # Tool name without parentheses means all uses are allowed
+            inner = "*"
+        index.setdefault(sys.intern(name), []).append(inner)
+    return index
+
+
 def build_script_command(
     script_path: Path,
     args: Optional[list[str]] = None,
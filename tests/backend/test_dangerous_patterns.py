@@ -244,3 +244,31 @@ class TestPermissionCallback:
         assert result.behavior == "deny"
         assert result.interrupt is True
         print("\n✓ Sandbox bypass attempts blocked")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_repeated_denials_interrupt(
+        self,
+        mock_permission_manager,
+        mock_context
+    ) -> None:
+        """Test interrupts after repeated denials of one tool or of all tools."""
+        mock_permission_manager.is_allowed.return_value = False
+        callback = create_permission_callback(
+            permission_manager=mock_permission_manager,
+            max_denials_before_interrupt=2,
+        )
+
+        read = {"file_path": "./secret.txt"}
+        assert not (await callback("Read", read, mock_context)).interrupt
+        assert (await callback("Read", read, mock_context)).interrupt
+
+        callback = create_permission_callback(
+            permission_manager=mock_permission_manager,
+            max_denials_before_interrupt=2,
+        )
+        results = [
+            await callback(tool, {"path": "./secret"}, mock_context)
+            for tool in ("Read", "Write", "Glob", "Grep")
+        ]
+        assert [r.interrupt for r in results] == [False, False, False, True]
@@ -0,0 +1,366 @@
+"""
+Tests for permission rule matching in PermissionConfigManager.
+
+Covers deny-over-allow precedence, tool-name globs, path patterns resolved
+against the working directory, Bash compound-command handling, and
+recompilation of rules when the configuration changes.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from pydantic import ValidationError
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.permission_config import (  # noqa: E402
+    PermissionConfig,
+    PermissionConfigManager,
+    PermissionMode,
+    PermissionRules,
+    create_default_permissions_file,
+    default_permission_config,
+)
+
+
+def write_config(
+    path: Path,
+    allow: list[str],
+    deny: Optional[list[str]] = None,
+    ask: Optional[list[str]] = None,
+) -> Path:
+    """Write a minimal permissions.json and return its path."""
+    path.write_text(json.dumps({
+        "permissions": {
+            "allow": allow,
+            "deny": deny or [],
+            "ask": ask or [],
+        }
+    }))
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    """Create a workspace with a skills tree and a file outside it."""
+    ws = tmp_path / "workspace"
+    (ws / "skills" / "meow").mkdir(parents=True)
+    (ws / "skills" / "meow" / "meow.py").write_text("print('meow')")
+    (ws / "src").mkdir()
+    (tmp_path / "outside.txt").write_text("secret")
+    return ws
+
+
+def make_manager(
+    tmp_path: Path,
+    workspace: Path,
+    allow: list[str],
+    deny: Optional[list[str]] = None,
+    ask: Optional[list[str]] = None,
+) -> PermissionConfigManager:
+    """Create a manager for the given rules with workspace as working dir."""
+    config_path = write_config(tmp_path / "permissions.json", allow, deny, ask)
+    manager = PermissionConfigManager(config_path=config_path)
+    manager.set_working_directory(workspace)
+    return manager
+
+
+class TestPermissionMatching:
+    """Test allow/deny/ask rule evaluation."""
+
+    @pytest.mark.unit
+    def test_deny_takes_precedence_over_allow(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """A specific deny rule wins over a broad allow rule."""
+        manager = make_manager(
+            tmp_path, workspace, allow=["Bash(*)"], deny=["Bash(ps *)"]
+        )
+        assert manager.is_tool_allowed("Bash(ls -la)")
+        assert not manager.is_tool_allowed("Bash(ps aux)")
+
+    @pytest.mark.unit
+    def test_tool_name_rules_support_globs(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Bare tool-name rules match the tool name with fnmatch semantics."""
+        manager = make_manager(tmp_path, workspace, allow=["Grep", "Todo*"])
+        assert manager.is_tool_allowed("Grep")
+        assert manager.is_tool_allowed("Grep(foo)")
+        assert manager.is_tool_allowed("TodoWrite")
+        assert not manager.is_tool_allowed("Glob")
+
+    @pytest.mark.unit
+    def test_non_path_tool_argument_globs(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Argument globs like Skill(test:*) apply only to their own tool."""
+        manager = make_manager(tmp_path, workspace, allow=["Skill(test:*)"])
+        assert manager.is_tool_allowed("Skill(test:unit)")
+        assert not manager.is_tool_allowed("Skill(deploy)")
+        assert not manager.is_tool_allowed("Agent(test:unit)")
+
+    @pytest.mark.unit
+    def test_many_wildcard_globs_do_not_backtrack(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Globs with many stars match long arguments in linear time."""
+        manager = make_manager(
+            tmp_path, workspace,
+            allow=["WebFetch(*)"],
+            deny=["WebFetch(" + "*a" * 12 + "*b)"],
+        )
+        assert manager.is_tool_allowed(f"WebFetch({'a' * 500})")
+        assert not manager.is_tool_allowed(f"WebFetch({'a' * 500}b)")
+
+    @pytest.mark.unit
+    def test_path_rules_resolve_against_working_directory(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Relative and absolute paths are resolved before matching."""
+        manager = make_manager(tmp_path, workspace, allow=["Read(./**)"])
+        assert manager.is_tool_allowed("Read(./skills/meow/meow.py)")
+        assert manager.is_tool_allowed(f"Read({workspace}/src/new.txt)")
+        assert not manager.is_tool_allowed("Read(../outside.txt)")
+        assert not manager.is_tool_allowed("Read(./src/../../outside.txt)")
+
+    @pytest.mark.unit
+    def test_path_rules_with_file_glob(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """A trailing file glob restricts matches to that extension."""
+        manager = make_manager(
+            tmp_path, workspace, allow=["Read(./skills/**/*.py)"]
+        )
+        assert manager.is_tool_allowed("Read(./skills/meow/meow.py)")
+        assert not manager.is_tool_allowed("Read(./skills/meow/README.md)")
+        assert not manager.is_tool_allowed("Read(./src/main.py)")
+
+    @pytest.mark.unit
+    def test_path_rules_follow_symlinks(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """A symlink inside the workspace pointing outside is not allowed."""
+        (workspace / "escape").symlink_to(tmp_path)
+        manager = make_manager(tmp_path, workspace, allow=["Read(./**)"])
+        assert not manager.is_tool_allowed("Read(./escape/outside.txt)")
+
+    @pytest.mark.unit
+    def test_rule_base_replaced_by_symlink(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """A denied base turned into a symlink denies its target's files."""
+        (workspace / "secrets").mkdir()
+        (workspace / "real_secrets").mkdir()
+        (workspace / "real_secrets" / "k").write_text("key")
+        manager = make_manager(
+            tmp_path, workspace, allow=["Read(*)"], deny=["Read(./secrets/**)"]
+        )
+        assert manager.is_tool_allowed("Read(./real_secrets/k)")
+
+        (workspace / "secrets").rmdir()
+        (workspace / "secrets").symlink_to(workspace / "real_secrets")
+        assert not manager.is_tool_allowed("Read(./real_secrets/k)")
+
+    @pytest.mark.unit
+    def test_bash_compound_commands_are_never_allowed(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Compound and substituted commands are denied even under Bash(*)."""
+        manager = make_manager(tmp_path, workspace, allow=["Bash(*)"])
+        assert manager.is_tool_allowed("Bash(git status)")
+        for command in ("cd x && ls", "ls | wc", "a ; b", "a || b",
+                        "echo $(id)", "echo `id`"):
+            assert not manager.is_tool_allowed(f"Bash({command})"), command
+
+    @pytest.mark.unit
+    def test_bash_path_patterns(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Bash rules with a path component match the script location."""
+        manager = make_manager(
+            tmp_path, workspace, allow=["Bash(python ./skills/**)"]
+        )
+        assert manager.is_tool_allowed("Bash(python ./skills/meow/meow.py)")
+        assert not manager.is_tool_allowed("Bash(python ./src/main.py)")
+        assert not manager.is_tool_allowed("Bash(bash ./skills/meow/meow.py)")
+
+    @pytest.mark.unit
+    def test_needs_confirmation(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Ask rules flag matching calls for confirmation."""
+        manager = make_manager(
+            tmp_path, workspace, allow=["Bash(*)"], ask=["Bash(git push:*)"]
+        )
+        assert manager.needs_confirmation("Bash(git push origin main)")
+        assert not manager.needs_confirmation("Bash(git status)")
+
+    @pytest.mark.unit
+    def test_rules_recompile_after_reload(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Rewriting the config file takes effect after a reload."""
+        manager = make_manager(tmp_path, workspace, allow=["Grep"])
+        assert manager.is_tool_allowed("Grep")
+
+        write_config(tmp_path / "permissions.json", allow=["Glob"])
+        manager.reload()
+        assert not manager.is_tool_allowed("Grep")
+        assert manager.is_tool_allowed("Glob")
+
+    @pytest.mark.unit
+    def test_unchanged_file_reuses_parsed_config(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Managers loading an unchanged file share one frozen config."""
+        first = make_manager(tmp_path, workspace, allow=["Grep"])
+        second = PermissionConfigManager(
+            config_path=tmp_path / "permissions.json", poll_interval_s=0
+        )
+        assert first.load() is second.load()
+
+        with pytest.raises(ValidationError):
+            first.load().defaultMode = PermissionMode.BYPASS
+
+        write_config(tmp_path / "permissions.json", allow=["Grep", "Glob"])
+        assert second.load().permissions.allow == ("Grep", "Glob")
+
+    @pytest.mark.unit
+    def test_enabled_tools_exclude_disabled(self, tmp_path: Path) -> None:
+        """Disabled tools are removed from the enabled set."""
+        config_path = tmp_path / "permissions.json"
+        config_path.write_text(json.dumps({
+            "tools": {"enabled": ["Read", "Bash"], "disabled": ["Bash"]}
+        }))
+        manager = PermissionConfigManager(config_path=config_path)
+        assert manager.get_enabled_tools() == ["Read"]
+        assert manager.is_tool_enabled("Read")
+        assert not manager.is_tool_enabled("Bash")
+
+    @pytest.mark.unit
+    def test_reload_checks_are_throttled(self, tmp_path: Path) -> None:
+        """File changes are picked up only after the poll interval."""
+        config_path = write_config(tmp_path / "permissions.json", ["Grep"])
+        manager = PermissionConfigManager(
+            config_path=config_path, poll_interval_s=60
+        )
+        assert manager.is_tool_allowed("Grep")
+        manager.load()  # First stat check starts the poll interval
+
+        write_config(config_path, allow=["Glob"])
+        assert manager.is_tool_allowed("Grep")
+        manager.reload()
+        assert manager.is_tool_allowed("Glob")
+
+    @pytest.mark.unit
+    def test_cached_denials_expire_on_config_change(
+        self, tmp_path: Path, workspace: Path
+    ) -> None:
+        """Remembered denials do not outlive a new working dir or reload."""
+        manager = make_manager(tmp_path, workspace, allow=["Read(./meow/**)"])
+        call = "Read(../skills/meow/meow.py)"
+        assert not manager.is_tool_allowed(call)
+        manager.set_working_directory(workspace / "skills")
+        assert manager.is_tool_allowed(call)
+
+        assert not manager.is_tool_allowed("Glob")
+        write_config(tmp_path / "permissions.json", allow=["Glob"])
+        manager.reload()
+        assert manager.is_tool_allowed("Glob")
+
+    @pytest.mark.unit
+    def test_save_replaces_file_atomically(self, tmp_path: Path) -> None:
+        """Saving writes the full config and leaves no temp file behind."""
+        config_path = write_config(tmp_path / "permissions.json", ["Grep"])
+        manager = PermissionConfigManager(config_path=config_path)
+        manager.load()
+        manager.save(config_path)
+
+        saved = json.loads(config_path.read_text())
+        assert saved["permissions"]["allow"] == ["Grep"]
+        assert not (tmp_path / "permissions.json.tmp").exists()
+        assert manager.reload().permissions.allow == ("Grep",)
+
+    @pytest.mark.unit
+    def test_default_permissions_file_round_trips(self, tmp_path: Path) -> None:
+        """The default permissions file loads back as the default config."""
+        config_path = create_default_permissions_file(tmp_path / "config")
+        assert config_path == tmp_path / "config" / "permissions.json"
+        manager = PermissionConfigManager(config_path=config_path)
+        assert manager.load() == default_permission_config()
+
+    @pytest.mark.unit
+    def test_decision_logs_matching_rule(
+        self, tmp_path: Path, workspace: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """The debug log names the rule that decided the call."""
+        manager = make_manager(
+            tmp_path, workspace,
+            allow=["Grep", "Skill(test:*)", "Bash(git:*)"],
+            deny=["Bash(git push:*)"],
+        )
+        with caplog.at_level("DEBUG", logger="src.core.permission_config"):
+            assert manager.is_tool_allowed("Skill(test:unit)")
+            assert not manager.is_tool_allowed("Bash(git push origin)")
+        assert "allowed by rule Skill(test:*)" in caplog.text
+        assert "denied by rule Bash(git push:*)" in caplog.text
+
+    @pytest.mark.unit
+    def test_patterns_for_tool(self, tmp_path: Path, workspace: Path) -> None:
+        """Per-tool pattern lookups keep rule order and expand bare names."""
+        manager = make_manager(
+            tmp_path, workspace,
+            allow=["Bash(python ./skills/**)", "Read", "Bash(ls:*)"],
+            deny=["Bash(rm:*)"],
+        )
+        assert manager.get_allowed_patterns_for_tool("Bash") == [
+            "python ./skills/**", "ls:*"
+        ]
+        assert manager.get_allowed_patterns_for_tool("Read") == ["*"]
+        assert manager.get_allowed_patterns_for_tool("Write") == []
+        assert manager.get_denied_patterns_for_tool("Bash") == ["rm:*"]
+
+    @pytest.mark.unit
+    def test_matches_allow(self, tmp_path: Path, workspace: Path) -> None:
+        """A candidate is tested against all allowed globs of its tool."""
+        manager = make_manager(
+            tmp_path, workspace, allow=["Bash(git *)", "Bash(ls)", "Read"]
+        )
+        assert manager.matches_allow("Bash", "git status")
+        assert manager.matches_allow("Bash", "ls")
+        assert not manager.matches_allow("Bash", "rm -rf /")
+        assert manager.matches_allow("Read", "anything")
+        assert not manager.matches_allow("Write", "x")
+
+    @pytest.mark.unit
+    def test_reload_detects_restored_older_file(self, tmp_path: Path) -> None:
+        """A file replaced by one with an older mtime is still reloaded."""
+        config_path = write_config(tmp_path / "permissions.json", ["Grep"])
+        manager = PermissionConfigManager(
+            config_path=config_path, poll_interval_s=0
+        )
+        assert manager.is_tool_allowed("Grep")
+
+        mtime = config_path.stat().st_mtime
+        write_config(config_path, allow=["Glob"])
+        os.utime(config_path, (mtime - 60, mtime - 60))
+        assert manager.is_tool_allowed("Glob")
+
+    @pytest.mark.unit
+    def test_use_config_ignores_config_files(self, tmp_path: Path) -> None:
+        """An in-memory config stays in effect until an explicit reload."""
+        config_path = write_config(tmp_path / "permissions.json", ["Grep"])
+        manager = PermissionConfigManager(
+            config_path=config_path, poll_interval_s=0
+        )
+        manager.use_config(
+            PermissionConfig(permissions=PermissionRules(allow=["Glob"]))
+        )
+        write_config(tmp_path / "permissions.json", allow=["LS"])
+        assert manager.is_tool_allowed("Glob")
+        assert not manager.is_tool_allowed("LS")
@@ -0,0 +1,251 @@
+"""
+Tests for the permission profile manager.
+
+Covers loading a profile file, building session-specific rules from the
+session_workspace section, and the tool/pattern getters derived from the
+active profile.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.permission_profiles import (  # noqa: E402
+    PermissionManager,
+    ProfileNotFoundError,
+    validate_profile_file,
+)
+
+PROFILE_YAML = """\
+name: user
+description: Test profile
+tools:
+  enabled: [Read, Write, Bash, Grep]
+  disabled: [Write]
+  permission_checked: [Read, Bash]
+permissions:
+  allow:
+    - Read(./docs/**)
+    - Grep
+  deny:
+    - Bash(rm *)
+session_workspace:
+  allow:
+    - Read({workspace}/**)
+    - Bash(python *)
+  deny:
+    - Read({workspace}/secret/**)
+  allowed_dirs:
+    - "{workspace}"
+"""
+
+
+@pytest.fixture
+def profile_path(tmp_path: Path) -> Path:
+    """Write the test profile and return its path."""
+    path = tmp_path / "permissions.yaml"
+    path.write_text(PROFILE_YAML)
+    return path
+
+
+class TestPermissionProfiles:
+    """Test profile loading and session-specific rules."""
+
+    @pytest.mark.unit
+    def test_patterns_follow_session_context(self, profile_path: Path) -> None:
+        """Tool patterns come from the session rules once a session is set."""
+        manager = PermissionManager(profile_path=profile_path)
+        assert manager.get_allowed_patterns_for_tool("Read") == ["./docs/**"]
+        assert manager.get_denied_patterns_for_tool("Bash") == ["rm *"]
+
+        manager.set_session_context("s1", "./sessions/s1/workspace")
+        assert manager.get_allowed_patterns_for_tool("Read") == [
+            "./sessions/s1/workspace/**"
+        ]
+        assert manager.get_denied_patterns_for_tool("Bash") == []
+
+        manager.clear_session_context()
+        assert manager.get_allowed_patterns_for_tool("Read") == ["./docs/**"]
+
+    @pytest.mark.unit
+    def test_managers_share_parsed_profile(self, profile_path: Path) -> None:
+        """An unchanged profile file is parsed once per process."""
+        first = PermissionManager(profile_path=profile_path).profile
+        assert PermissionManager(profile_path=profile_path).profile is first
+
+        profile_path.write_text(PROFILE_YAML.replace("Test profile", "Edited"))
+        assert PermissionManager(profile_path=profile_path).profile is not first
+
+    @pytest.mark.unit
+    def test_reload_picks_up_same_size_edit(self, profile_path: Path) -> None:
+        """An explicit reload parses the file even if mtime and size match."""
+        manager = PermissionManager(profile_path=profile_path)
+        assert manager.profile.description == "Test profile"
+
+        stat = profile_path.stat()
+        profile_path.write_text(PROFILE_YAML.replace("Test profile", "Best profile"))
+        os.utime(profile_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        manager.reload_profile()
+        assert manager.profile.description == "Best profile"
+
+    @pytest.mark.unit
+    def test_parsed_yaml_profile_is_cached(
+        self, profile_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A JSON cache of the profile is reused until the YAML changes."""
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv("AGENTUM_PROFILE_CACHE_DIR", str(cache_dir))
+        first = PermissionManager(profile_path=profile_path).profile
+        caches = list(cache_dir.glob(".permissions.yaml.*.cache.json"))
+        assert len(caches) == 1
+        assert PermissionManager(profile_path=profile_path).profile == first
+
+        profile_path.write_text(PROFILE_YAML.replace("Test profile", "Edited"))
+        edited = PermissionManager(profile_path=profile_path).profile
+        assert edited.description == "Edited"
+        remaining = list(cache_dir.glob(".permissions.yaml.*.cache.json"))
+        assert len(remaining) == 1 and remaining != caches
+
+    @pytest.mark.unit
+    def test_tool_sets(self, profile_path: Path) -> None:
+        """Enabled, disabled, checked and pre-approved tools are derived."""
+        manager = PermissionManager(profile_path=profile_path)
+        assert sorted(manager.get_enabled_tools()) == ["Bash", "Grep", "Read"]
+        assert manager.get_disabled_tools() == {"Write"}
+        assert manager.get_permission_checked_tools() == {"Read", "Bash"}
+        assert manager.get_pre_approved_tools() == ["Grep"]
+
+    @pytest.mark.unit
+    def test_repeated_session_context_keeps_profile(
+        self, profile_path: Path
+    ) -> None:
+        """Setting the same session context again reuses the built profile."""
+        manager = PermissionManager(profile_path=profile_path)
+        manager.set_session_context("s1", "./sessions/s1/workspace")
+        built = manager.active_profile
+        manager.set_session_context("s1", "./sessions/s1/workspace")
+        assert manager.active_profile is built
+
+        manager.set_session_context("s2", "./sessions/s2/workspace")
+        built = manager.active_profile
+        assert built.name == "user:s2"
+        manager.reload_profile()
+        assert manager.active_profile is built
+
+        profile_path.write_text(PROFILE_YAML.replace("Test profile", "Edited"))
+        manager.reload_profile()
+        assert manager.active_profile is not built
+        assert manager.active_profile.name == "user:s2"
+
+    @pytest.mark.unit
+    def test_unchanged_profile_keeps_config(self, profile_path: Path) -> None:
+        """Re-applying the active profile does not rebuild the config."""
+        manager = PermissionManager(profile_path=profile_path)
+        manager.activate()
+        config = manager._config_manager.load()
+        manager.clear_session_context()
+        manager.reload_profile()
+        assert manager._config_manager.load() is config
+
+        manager.set_session_context("s1", "./sessions/s1/workspace")
+        assert manager._config_manager.load() is not config
+
+    @pytest.mark.unit
+    def test_checks_load_the_profile(self, profile_path: Path) -> None:
+        """Permission checks use the profile even as the first call."""
+        assert PermissionManager(profile_path=profile_path).is_allowed("Grep")
+        manager = PermissionManager(profile_path=profile_path)
+        assert not manager.needs_confirmation("Bash(rm -rf x)")
+        assert manager.active_profile.name == "user"
+
+    @pytest.mark.unit
+    def test_sandbox_config_resolved_per_workspace(self, tmp_path: Path) -> None:
+        """Sandbox placeholders resolve against the current workspace."""
+        path = tmp_path / "permissions.yaml"
+        path.write_text(
+            PROFILE_YAML + "sandbox:\n  writable_paths: ['{workspace_dir}']\n"
+        )
+        manager = PermissionManager(profile_path=path)
+        workspace = tmp_path / "ws"
+        manager.set_session_context("s1", "./ws", workspace)
+        sandbox = manager.get_sandbox_config()
+        assert sandbox.writable_paths == [str(workspace)]
+        assert manager.get_sandbox_config() is sandbox
+
+        manager.clear_session_context()
+        assert manager.get_sandbox_config().writable_paths == [""]
+
+    @pytest.mark.unit
+    def test_activate_notifies_tracer(self, profile_path: Path) -> None:
+        """Activation reports the profile summary to the tracer."""
+        tracer = MagicMock()
+        manager = PermissionManager(profile_path=profile_path)
+        manager.set_tracer(tracer)
+        assert manager.activate().name == "user"
+
+        kwargs = tracer.on_profile_switch.call_args.kwargs
+        assert kwargs["profile_name"] == "user"
+        assert sorted(kwargs["tools"]) == ["Bash", "Grep", "Read"]
+        assert kwargs["allow_rules_count"] == 2
+        assert kwargs["deny_rules_count"] == 1
+        assert kwargs["profile_path"] == str(profile_path)
+
+    @pytest.mark.unit
+    def test_json_profile_round_trip(self, profile_path: Path) -> None:
+        """A profile saved as JSON loads back unchanged."""
+        manager = PermissionManager(profile_path=profile_path)
+        json_path = manager.save_profile(
+            manager.profile, profile_path.with_suffix(".json")
+        )
+        loaded = PermissionManager(profile_path=json_path).profile
+        assert loaded == manager.profile
+
+        json_path.write_text("{not json")
+        with pytest.raises(ValueError, match="Failed to parse JSON profile"):
+            PermissionManager(profile_path=json_path).activate()
+
+    @pytest.mark.unit
+    def test_profile_cache_is_opt_in(
+        self, profile_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Without a cache directory no profile cache is written."""
+        monkeypatch.delenv("AGENTUM_PROFILE_CACHE_DIR", raising=False)
+        PermissionManager(profile_path=profile_path).activate()
+        assert not list(profile_path.parent.glob(".*.cache.json"))
+
+    @pytest.mark.unit
+    def test_profile_cache_from_other_source_is_ignored(
+        self, profile_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A cache file not written from the same YAML is not used."""
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv("AGENTUM_PROFILE_CACHE_DIR", str(cache_dir))
+        PermissionManager(profile_path=profile_path).activate()
+        (cache_path,) = cache_dir.glob(".permissions.yaml.*.cache.json")
+        entry = json.loads(cache_path.read_text())
+        entry["source"] = "0" * 32
+        entry["profile"]["permissions"]["allow"].append("Bash(*)")
+        cache_path.write_text(json.dumps(entry))
+
+        profile_path.touch()
+        os.utime(profile_path, ns=(0, profile_path.stat().st_mtime_ns + 1))
+        manager = PermissionManager(profile_path=profile_path)
+        assert "Bash(*)" not in manager.profile.permissions.allow
+
+    @pytest.mark.unit
+    def test_validate_profile_file(self, tmp_path: Path) -> None:
+        """Only the .yaml profile file satisfies the check."""
+        with pytest.raises(ProfileNotFoundError):
+            validate_profile_file(tmp_path)
+
+        (tmp_path / "permissions.json").write_text("{}")
+        with pytest.raises(ProfileNotFoundError):
+            validate_profile_file(tmp_path)
+        (tmp_path / "permissions.yaml").write_text(PROFILE_YAML)
+        assert validate_profile_file(tmp_path) == tmp_path / "permissions.yaml"